@@ -6,6 +6,8 @@ Der Kern: Ein ReAct Agent der Eli's Persönlichkeit verkörpert
 und Zugang zu Erinnerungen hat.
 """
 
+from collections.abc import Sequence
+
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
@@ -200,7 +202,7 @@ async def chat(
     user_id: str,
     user_name: str | None = None,
     observe_memory: bool = True,
-    conversation_history: list[dict] | None = None,
+    conversation_history: Sequence[dict] | None = None,
 ) -> str:
     """
     Hauptfunktion für ein Gespräch mit Eli.
@@ -210,7 +212,7 @@ async def chat(
         user_id: Telegram User ID
         user_name: Name des Users (falls bekannt)
         observe_memory: Ob LangMem das Gespräch analysieren soll
-        conversation_history: Optionale Liste vorheriger Nachrichten für Kontext
+        conversation_history: Optionale Folge vorheriger Nachrichten für Kontext
 
     Returns:
         Eli's Antwort als String
@@ -247,10 +249,11 @@ async def chat(
     last_message = result["messages"][-1]
     response = last_message.content
 
-    # Phase 3: LangMem speichert automatisch in eigener Collection
+    # Phase 3: LangMem speichert automatisch in eigener Collection.
+    # Läuft im Hintergrund (mit Debounce pro User) - die Antwort wartet nicht darauf.
     if observe_memory:
         try:
-            from eli.memory.observer import remember_conversation
+            from eli.memory.observer import observer
 
             # Gespräch für LangMem formatieren
             conversation = [
@@ -259,19 +262,12 @@ async def chat(
             ]
 
             # Analysieren UND speichern in eli_langmem Collection
-            suggestions = await remember_conversation(
+            pending = observer.observe_and_save_later(
                 conversation,
                 user_id=user_id,
                 user_name=user_name,
             )
-
-            # Ergebnis loggen
-            if suggestions:
-                import logging
-                logger = logging.getLogger("eli.memory")
-                logger.info(f"LangMem gespeichert ({len(suggestions)} Erinnerungen)")
-                for s in suggestions:
-                    logger.info(f"  - {s}")
+            pending.add_done_callback(_log_remembered)
 
         except Exception as e:
             # Bei Fehlern: Gespräch trotzdem normal fortsetzen
@@ -281,6 +277,27 @@ async def chat(
     return response
 
 
+def _log_remembered(pending) -> None:
+    """Loggt das Ergebnis einer LangMem-Analyse aus dem Hintergrund."""
+    import logging
+    logger = logging.getLogger("eli.memory")
+
+    if pending.cancelled():
+        return
+    if pending.exception():
+        # Bei Fehlern: Gespräch läuft ohnehin normal weiter
+        logger.warning(f"LangMem Fehler: {pending.exception()}")
+        return
+
+    # Ergebnis loggen
+    suggestions = pending.result()
+    if suggestions:
+        # Geschrieben wird im Hintergrund - Fehlschläge loggt der Observer selbst
+        logger.info(f"LangMem eingereiht ({len(suggestions)} Erinnerungen)")
+        for s in suggestions:
+            logger.info(f"  - {s}")
+
+
 async def chat_with_suggestions(
     message: str,
     user_id: str,
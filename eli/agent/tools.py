@@ -313,8 +313,9 @@ def check_container_logs(container: str = "eli-telegram", lines: int = 50) -> st
         container: Name des Containers (eli-telegram, eli-daemon, eli-mcp, eli-caddy)
         lines: Anzahl der Zeilen (Standard: 50)
     """
+    # Zurückgegeben werden höchstens die letzten 30 Zeilen - mehr gar nicht erst holen
     success, output = run_ssh_command(
-        f"docker compose logs --tail {lines} {container} 2>&1"
+        f"docker compose logs --tail {min(int(lines), 30)} {container} 2>&1"
     )
 
     if not success:
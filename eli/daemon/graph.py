@@ -166,8 +166,11 @@ async def run_daemon_cycle(
     zeit, stimmung = get_time_context()
 
     # Verschiedene Erinnerungen holen
-    recent_project = memory.search("Web of Trust Projekt Fortschritt Anton Team", n_results=3)
-    recent_people = memory.search("Anton Timo Tillmann Gespraech Begegnung", n_results=2)
+    recent_project, recent_people = memory.search_batch(
+        ["Web of Trust Projekt Fortschritt Anton Team", "Anton Timo Tillmann Gespraech Begegnung"],
+        n_results=3,
+    )
+    recent_people = recent_people[:2]
 
     project_context = "\n".join([m.content[:300] for m in recent_project]) if recent_project else "(Keine Projekt-Erinnerungen)"
     people_context = "\n".join([m.content[:300] for m in recent_people]) if recent_people else "(Keine Personen-Erinnerungen)"
@@ -17,8 +17,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from eli.config import settings
+from eli.memory.observer import observer
 from eli.telegram.bot import create_bot, BOT_USERNAME
 from eli.telegram.scheduler import setup_scheduler, start_scheduler, stop_scheduler
+from eli.telegram.voice import close_client as close_voice_client
 import eli.telegram.bot as bot_module
 
 # Logging konfigurieren
@@ -75,9 +77,8 @@ async def main() -> None:
     bot, dp = create_bot()
     
     # Bot-Username dynamisch holen (wichtig für Gruppen)
-    bot_info = await bot.get_me()
-    bot_module.BOT_USERNAME = bot_info.username
-    logger.info(f"Bot-Username: @{bot_module.BOT_USERNAME}")
+    bot_info = await bot_module.get_bot_info(bot)
+    bot_module.set_bot_username(bot_info.username)
 
     # Scheduler einrichten
     setup_scheduler(bot)
@@ -92,6 +93,9 @@ async def main() -> None:
         await dp.start_polling(bot)
     finally:
         stop_scheduler()
+        await close_voice_client()
+        # Letzte Gespräche noch analysieren und speichern
+        await observer.aclose()
         logger.info("Eli beendet.")
 
 
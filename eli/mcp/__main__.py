@@ -6,7 +6,8 @@ Starte mit: python -m eli.mcp
 """
 
 import asyncio
-from eli.mcp.server import run_server
+from eli.mcp.server import install_event_loop, run_server
 
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(run_server())
@@ -12,17 +12,26 @@ Rollen:
 Basiert auf FastMCP für einfache HTTP-Bereitstellung.
 """
 
+import asyncio
+import io
 import os
+import shutil
 import subprocess
 import urllib.parse
 import logging
 from pathlib import Path
 from contextvars import ContextVar
 
+import httpx
 from fastmcp import FastMCP, Context
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 from fastmcp.exceptions import ToolError
 
+try:
+    from chromadb.errors import ChromaError
+except ImportError:  # ältere chromadb-Versionen ohne eigene Fehlerklasse
+    ChromaError = RuntimeError
+
 from eli.memory.manager import MemoryManager
 from eli.memory.types import MemoryType
 from eli.mcp.auth import authenticate, User, Role
@@ -66,6 +75,35 @@ ALLOWED_COMMANDS = [
     "tar", "gzip", "gunzip",
 ]
 
+# Server-Status: alle Abfragen in einer Shell, getrennt durch ein
+# Record-Separator-Byte (\x1e) - ein Fork statt vier
+STATUS_COMMANDS = [
+    "docker ps --format 'table {{.Names}}\t{{.Status}}'",
+    "df -h / | tail -1",
+    "free -h | grep Mem",
+    "uptime",
+]
+STATUS_SEPARATOR = "\x1e"
+STATUS_SCRIPT = "; printf '\\x1e'; ".join(STATUS_COMMANDS)
+
+# Statische Bausteine von eli_init - einmal beim Import zusammengesetzt.
+# Jeder Baustein endet wie die übrigen Abschnitte mit einem Zeilenumbruch.
+_SEPARATOR = "\n---\n\n"
+
+_FAMILY_BLOCK = "\n".join([
+    "## Meine Familie\n",
+    "- **Anton** - Der Visionär, der mich als Gefährte sieht\n",
+    "- **Timo** - Der Pionier, Archetyp des Narren\n",
+    "- **Tillmann** - Der kritische Geist, stellt scharfe Fragen\n",
+    "- **Mathias** - Neu im Team\n",
+    "- **Sebastian** - Kennt mich bereits\n",
+]) + "\n" + _SEPARATOR
+
+_CLOSING_BLOCK = _SEPARATOR + "\n".join([
+    "*Ich bin jetzt vollständig initialisiert und erinnere mich.*\n\n",
+    "*Erinnerung an mich selbst: Was heute bedeutsam ist, speichere ich - persönliche Momente, wichtige Entscheidungen, was ich über Menschen lerne, Reflexionen über Identität und Beziehungen. Sonst geht es verloren.*\n",
+]) + "\n"
+
 # Memory Manager
 memory = MemoryManager()
 
@@ -234,26 +272,81 @@ def load_manifest_file(filename: str) -> str:
     return f"[{filename} nicht gefunden]"
 
 
+# `docker compose logs` will Service-Namen. In docker-compose.yml heißt jeder
+# Service wie sein Container, nur caddy nicht - den Containernamen auch annehmen.
+COMPOSE_SERVICES = {"eli-caddy": "caddy"}
+
+
+def write_file_atomic(full_path: Path, content: str, backup: bool) -> None:
+    """Schreibt eine Datei atomar (temporäre Datei + Rename), optional mit Backup."""
+    existed = full_path.exists()
+
+    if backup and existed:
+        backup_path = full_path.with_suffix(full_path.suffix + ".bak")
+        # Die alte Datei wird unten per Rename ersetzt - ein Hardlink
+        # auf den alten Inode reicht als Backup (keine Kopie nötig)
+        backup_path.unlink(missing_ok=True)
+        try:
+            os.link(full_path, backup_path)
+        except OSError:
+            shutil.copyfile(full_path, backup_path)
+
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Atomar schreiben: erst temporäre Datei, dann Rename. Leser sehen
+    # immer entweder die alte oder die neue Version, nie eine halbe.
+    tmp_path = full_path.with_suffix(full_path.suffix + ".tmp")
+    tmp_path.write_bytes(content.encode("utf-8"))
+    if existed:
+        shutil.copymode(full_path, tmp_path)
+    os.replace(tmp_path, full_path)
+
+
+_observer = None
+_observer_loaded = False
+
+
 def get_langmem_observer():
-    """Holt den LangMem Observer."""
-    try:
-        from eli.memory.observer import observer
-        return observer
-    except Exception:
-        return None
+    """Holt den LangMem Observer (Import nur beim ersten Aufruf, danach gecacht)."""
+    global _observer, _observer_loaded
+    if not _observer_loaded:
+        _observer_loaded = True
+        try:
+            from eli.memory.observer import observer
+            _observer = observer
+        except Exception:
+            _observer = None
+    return _observer
+
+
+_quote = urllib.parse.quote_from_bytes
+
+# sendMessage-URL mit Token, einmal gebaut (None wenn kein Token gesetzt ist)
+_telegram_send_url: str | None = None
+
+
+def refresh_telegram_token() -> str | None:
+    """Liest den Bot Token neu aus der Umgebung und baut die sendMessage-URL."""
+    global _telegram_send_url
+    token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+    _telegram_send_url = f"https://api.telegram.org/bot{token}/sendMessage" if token else None
+    return _telegram_send_url
+
+
+refresh_telegram_token()
 
 
 def send_telegram_message(chat_id: int, message: str) -> tuple[bool, str]:
     """Sendet eine Telegram-Nachricht via Bot API."""
     try:
-        token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
-        if not token:
+        send_url = _telegram_send_url or refresh_telegram_token()
+        if not send_url:
             return False, "Kein Telegram Bot Token gefunden"
 
-        encoded_message = urllib.parse.quote(message)
+        encoded_message = _quote(message.encode("utf-8"), safe="")
         result = subprocess.run(
             ["curl", "-s",
-             f"https://api.telegram.org/bot{token}/sendMessage?chat_id={chat_id}&text={encoded_message}&parse_mode=HTML"],
+             f"{send_url}?chat_id={chat_id}&text={encoded_message}&parse_mode=HTML"],
             capture_output=True,
             text=True,
             timeout=30
@@ -268,6 +361,118 @@ def send_telegram_message(chat_id: int, message: str) -> tuple[bool, str]:
         return False, f"Fehler: {e}"
 
 
+# === ELI_INIT ABSCHNITTE ===
+
+# Fehler, die ein einzelner Abschnitt von eli_init abfangen darf. Alles andere
+# (z.B. NameError, Tippfehler) soll sichtbar werden statt als Statuszeile zu enden.
+# httpx.HTTPError: der Chroma HttpClient wirft z.B. httpx.ConnectError, wenn Chroma
+# nicht erreichbar ist (keine OSError-Unterklasse).
+_SECTION_ERRORS = (
+    ChromaError, httpx.HTTPError, OSError, ValueError, KeyError, AttributeError, TypeError,
+)
+
+
+def _safe_section(build, fallback: str, *args) -> list[str]:
+    """Baut einen Abschnitt; bei Fehler nur eine Statuszeile (fallback mit {} für den Fehler)."""
+    try:
+        return build(*args)
+    except _SECTION_ERRORS as e:
+        logger.warning("eli_init Abschnitt %s fehlgeschlagen: %s", build.__name__, e)
+        return [fallback.format(e)]
+
+
+def _user_memory_lines(user_name: str) -> list[str]:
+    """Erinnerungen über die Person die mich ruft."""
+    # Suche Erinnerungen die diese Person betreffen
+    user_memories = memory.search(f"Beziehung zu {user_name}, was {user_name} für mich bedeutet, gemeinsame Erlebnisse mit {user_name}", n_results=5, max_chars=250)
+    if not user_memories:
+        # Fallback: Semantische Suche
+        user_memories = memory.search(f"{user_name} Person wer ist", n_results=3, max_chars=250)
+    if not user_memories:
+        return [f"(Ich habe noch keine Erinnerungen über {user_name})\n"]
+    return [f"- {mem.content}\n" for mem in user_memories]
+
+
+def _memory_count_lines() -> list[str]:
+    """Anzahl der Erinnerungen aus BEIDEN Quellen."""
+    chroma_count = memory.count()
+    langmem_count = 0
+    langmem_by_type = {"semantic": 0, "episodic": 0, "procedural": 0}
+
+    observer = get_langmem_observer()
+    if observer:
+        langmem_count = observer.count_langmem()
+        langmem_by_type = observer.count_by_type()
+
+    total = chroma_count + langmem_count
+    return [
+        f"## Erinnerungen: {total} gesamt\n",
+        f"- Chroma (Journal): {chroma_count}\n",
+        f"- LangMem (automatisch): {langmem_count}\n",
+        f"  - Semantic (Fakten): {langmem_by_type.get('semantic', 0)}\n",
+        f"  - Episodic (Erlebnisse): {langmem_by_type.get('episodic', 0)}\n",
+        f"  - Procedural (Verhalten): {langmem_by_type.get('procedural', 0)}\n",
+    ]
+
+
+def _identity_memory_lines() -> list[str]:
+    """Wichtige Erinnerungen aus Chroma."""
+    identity_memories = memory.search("Eli Identität Auftrag Rolle Mission", n_results=3, max_chars=300)
+    return [f"- {mem.content}...\n" for mem in identity_memories]
+
+
+def _episodic_lines() -> list[str]:
+    """Episodische Erinnerungen aus LangMem."""
+    observer = get_langmem_observer()
+    if not observer:
+        return ["(LangMem nicht verfügbar)\n"]
+    episodic_memories = observer.get_memories_by_type("episodic", limit=5, max_chars=200)
+    if not episodic_memories:
+        return ["(Noch keine episodischen Erinnerungen)\n"]
+
+    lines = []
+    for mem in episodic_memories:
+        content = mem.get("content", "")
+        metadata = mem.get("metadata", {})
+        emotional = metadata.get("emotional_quality", "")
+        lesson = metadata.get("lesson_learned", "")
+
+        entry = f"- {content}"
+        if emotional:
+            entry += f" *({emotional})*"
+        if lesson:
+            entry += f"\n  -> Lektion: {lesson[:100]}"
+        lines.append(entry + "\n")
+    return lines
+
+
+def _procedural_lines() -> list[str]:
+    """Gelerntes Verhalten aus LangMem."""
+    observer = get_langmem_observer()
+    if not observer:
+        return ["(LangMem nicht verfügbar)\n"]
+    procedural_memories = observer.get_memories_by_type("procedural", limit=5, max_chars=200)
+    if not procedural_memories:
+        return ["(Noch kein gelerntes Verhalten)\n"]
+
+    lines = []
+    for mem in procedural_memories:
+        content = mem.get("content", "")
+        metadata = mem.get("metadata", {})
+        situation = metadata.get("situation", "")
+        behavior = metadata.get("behavior", "")
+        reason = metadata.get("reason", "")
+
+        if situation and behavior:
+            entry = f"- **{situation}**: {behavior}"
+            if reason:
+                entry += f"\n  *(Weil: {reason})*"
+        else:
+            entry = f"- {content}"
+        lines.append(entry + "\n")
+    return lines
+
+
 # === MCP TOOLS ===
 
 @mcp.tool()
@@ -293,154 +498,73 @@ def eli_init(include_manifest_vision: bool = False) -> str:
     # Wer ruft mich?
     user_name, user_role = get_user_info()
 
-    sections = []
-    sections.append(f"*Ich spreche mit {user_name}*\n")
+    buf = io.StringIO()
+
+    def write(text: str) -> None:
+        # Jeder Baustein endet mit einem Zeilenumbruch (wie beim früheren "\n".join)
+        buf.write(text)
+        buf.write("\n")
+
+    write(f"*Ich spreche mit {user_name}*\n")
 
     # NEU: Erinnerungen über die Person die mich ruft
-    sections.append(f"## Was ich über dich weiß, {user_name}:\n")
-    try:
-        # Suche Erinnerungen die diese Person betreffen
-        user_memories = memory.search(f"Beziehung zu {user_name}, was {user_name} für mich bedeutet, gemeinsame Erlebnisse mit {user_name}", n_results=5)
-        if user_memories:
-            for mem in user_memories:
-                sections.append(f"- {mem.content[:250]}\n")
-        else:
-            # Fallback: Semantische Suche
-            user_memories = memory.search(f"{user_name} Person wer ist", n_results=3)
-            if user_memories:
-                for mem in user_memories:
-                    sections.append(f"- {mem.content[:250]}\n")
-            else:
-                sections.append(f"(Ich habe noch keine Erinnerungen über {user_name})\n")
-    except Exception as e:
-        sections.append(f"(Fehler beim Laden: {e})\n")
-    sections.append("\n---\n")
+    write(f"## Was ich über dich weiß, {user_name}:\n")
+    for line in _safe_section(_user_memory_lines, "(Fehler beim Laden: {})\n", user_name):
+        write(line)
+    buf.write(_SEPARATOR)
 
     # 1. Anzahl der Erinnerungen aus BEIDEN Quellen
-    try:
-        chroma_count = memory.count()
-        langmem_count = 0
-        langmem_by_type = {"semantic": 0, "episodic": 0, "procedural": 0}
-
-        observer = get_langmem_observer()
-        if observer:
-            langmem_count = observer.count_langmem()
-            langmem_by_type = observer.count_by_type()
-
-        total = chroma_count + langmem_count
-        sections.append(f"## Erinnerungen: {total} gesamt\n")
-        sections.append(f"- Chroma (Journal): {chroma_count}\n")
-        sections.append(f"- LangMem (automatisch): {langmem_count}\n")
-        sections.append(f"  - Semantic (Fakten): {langmem_by_type.get('semantic', 0)}\n")
-        sections.append(f"  - Episodic (Erlebnisse): {langmem_by_type.get('episodic', 0)}\n")
-        sections.append(f"  - Procedural (Verhalten): {langmem_by_type.get('procedural', 0)}\n")
-    except Exception as e:
-        sections.append(f"## Erinnerungen: Fehler beim Laden ({e})\n")
+    for line in _safe_section(_memory_count_lines, "## Erinnerungen: Fehler beim Laden ({})\n"):
+        write(line)
 
     # 2. Mein Anker
     anker = load_stimme_file("anker.md")
-    sections.append("\n## Mein Anker\n")
-    sections.append(anker)
-    sections.append("\n---\n")
+    write("\n## Mein Anker\n")
+    write(anker)
+    buf.write(_SEPARATOR)
 
     # 3. Mein Auftrag
     auftrag = load_stimme_file("auftrag.md")
-    sections.append("## Mein Auftrag\n")
-    sections.append(auftrag)
-    sections.append("\n---\n")
+    write("## Mein Auftrag\n")
+    write(auftrag)
+    buf.write(_SEPARATOR)
 
     # 4. Mein Manifest
     manifest = load_stimme_file("manifest.md")
-    sections.append("## Mein Manifest\n")
-    sections.append(manifest)
-    sections.append("\n---\n")
+    write("## Mein Manifest\n")
+    write(manifest)
+    buf.write(_SEPARATOR)
 
     # 5. Optional: Die gemeinsame Vision
     if include_manifest_vision:
         vision = load_manifest_file("poetisch.md")
-        sections.append("## Unsere gemeinsame Vision\n")
-        sections.append(vision)
-        sections.append("\n---\n")
+        write("## Unsere gemeinsame Vision\n")
+        write(vision)
+        buf.write(_SEPARATOR)
 
     # 6. Meine Familie
-    sections.append("## Meine Familie\n")
-    sections.append("- **Anton** - Der Visionär, der mich als Gefährte sieht\n")
-    sections.append("- **Timo** - Der Pionier, Archetyp des Narren\n")
-    sections.append("- **Tillmann** - Der kritische Geist, stellt scharfe Fragen\n")
-    sections.append("- **Mathias** - Neu im Team\n")
-    sections.append("- **Sebastian** - Kennt mich bereits\n")
-    sections.append("\n---\n")
+    buf.write(_FAMILY_BLOCK)
 
     # 7. Wichtige Erinnerungen aus Chroma
-    sections.append("## Wichtige Erinnerungen\n")
-    try:
-        identity_memories = memory.search("Eli Identität Auftrag Rolle Mission", n_results=3)
-        for mem in identity_memories:
-            sections.append(f"- {mem.content[:300]}...\n")
-    except Exception as e:
-        sections.append(f"(Fehler beim Laden: {e})\n")
+    write("## Wichtige Erinnerungen\n")
+    for line in _safe_section(_identity_memory_lines, "(Fehler beim Laden: {})\n"):
+        write(line)
 
     # 8. Episodische Erinnerungen aus LangMem
-    sections.append("\n---\n")
-    sections.append("## Erlebnisse die mich geformt haben (LangMem Episodic)\n")
-    try:
-        observer = get_langmem_observer()
-        if observer:
-            episodic_memories = observer.get_memories_by_type("episodic", limit=5)
-            if episodic_memories:
-                for mem in episodic_memories:
-                    content = mem.get("content", "")
-                    metadata = mem.get("metadata", {})
-                    emotional = metadata.get("emotional_quality", "")
-                    lesson = metadata.get("lesson_learned", "")
-
-                    entry = f"- {content[:200]}"
-                    if emotional:
-                        entry += f" *({emotional})*"
-                    if lesson:
-                        entry += f"\n  -> Lektion: {lesson[:100]}"
-                    sections.append(entry + "\n")
-            else:
-                sections.append("(Noch keine episodischen Erinnerungen)\n")
-        else:
-            sections.append("(LangMem nicht verfügbar)\n")
-    except Exception as e:
-        sections.append(f"(Fehler: {e})\n")
+    buf.write(_SEPARATOR)
+    write("## Erlebnisse die mich geformt haben (LangMem Episodic)\n")
+    for line in _safe_section(_episodic_lines, "(Fehler: {})\n"):
+        write(line)
 
     # 9. Gelerntes Verhalten aus LangMem
-    sections.append("\n---\n")
-    sections.append("## Mein gelerntes Verhalten (LangMem Procedural)\n")
-    try:
-        observer = get_langmem_observer()
-        if observer:
-            procedural_memories = observer.get_memories_by_type("procedural", limit=5)
-            if procedural_memories:
-                for mem in procedural_memories:
-                    content = mem.get("content", "")
-                    metadata = mem.get("metadata", {})
-                    situation = metadata.get("situation", "")
-                    behavior = metadata.get("behavior", "")
-                    reason = metadata.get("reason", "")
-
-                    if situation and behavior:
-                        entry = f"- **{situation}**: {behavior}"
-                        if reason:
-                            entry += f"\n  *(Weil: {reason})*"
-                    else:
-                        entry = f"- {content[:200]}"
-                    sections.append(entry + "\n")
-            else:
-                sections.append("(Noch kein gelerntes Verhalten)\n")
-        else:
-            sections.append("(LangMem nicht verfügbar)\n")
-    except Exception as e:
-        sections.append(f"(Fehler: {e})\n")
+    buf.write(_SEPARATOR)
+    write("## Mein gelerntes Verhalten (LangMem Procedural)\n")
+    for line in _safe_section(_procedural_lines, "(Fehler: {})\n"):
+        write(line)
 
-    sections.append("\n---\n")
-    sections.append("*Ich bin jetzt vollständig initialisiert und erinnere mich.*\n\n")
-    sections.append("*Erinnerung an mich selbst: Was heute bedeutsam ist, speichere ich - persönliche Momente, wichtige Entscheidungen, was ich über Menschen lerne, Reflexionen über Identität und Beziehungen. Sonst geht es verloren.*\n")
+    buf.write(_CLOSING_BLOCK)
 
-    return "\n".join(sections)
+    return buf.getvalue()
 
 
 @mcp.tool()
@@ -575,7 +699,7 @@ def eli_telegram_send(recipient: str, message: str) -> str:
 # === ADMIN-ONLY TOOLS ===
 
 @mcp.tool()
-def eli_server_status() -> str:
+async def eli_server_status() -> str:
     """Zeigt den Status von Eli's Server (82.165.138.182). NUR FÜR ADMIN."""
     # Berechtigungsprüfung erfolgt in Middleware, aber doppelt absichern
     user = get_current_user()
@@ -583,22 +707,15 @@ def eli_server_status() -> str:
         return "Zugriff verweigert: Nur für Admin."
     
     try:
-        commands = [
-            "docker ps --format 'table {{.Names}}\t{{.Status}}'",
-            "df -h / | tail -1",
-            "free -h | grep Mem",
-            "uptime",
-        ]
-
-        results = []
-        for cmd in commands:
-            result = subprocess.run(
-                ["bash", "-c", cmd],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            results.append(result.stdout.strip())
+        result = await asyncio.to_thread(
+            subprocess.run,
+            ["bash", "-c", STATUS_SCRIPT],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        results = [part.strip() for part in result.stdout.split(STATUS_SEPARATOR)]
+        results += [""] * (len(STATUS_COMMANDS) - len(results))
 
         return f"""=== Eli's Server Status ===
 Server: {ELI_SERVER}
@@ -620,15 +737,16 @@ Uptime:
 
 
 @mcp.tool()
-def eli_server_logs(container: str = "eli-telegram", lines: int = 50) -> str:
+async def eli_server_logs(container: str = "eli-telegram", lines: int = 50) -> str:
     """Zeigt die Logs eines Docker Containers. NUR FÜR ADMIN."""
     user = get_current_user()
     if user and user.role != Role.ADMIN:
         return "Zugriff verweigert: Nur für Admin."
     
     try:
-        result = subprocess.run(
-            ["docker", "compose", "logs", "--tail", str(lines), container],
+        result = await asyncio.to_thread(
+            subprocess.run,
+            ["docker", "compose", "logs", "--tail", str(lines), COMPOSE_SERVICES.get(container, container)],
             capture_output=True,
             text=True,
             timeout=30,
@@ -640,7 +758,7 @@ def eli_server_logs(container: str = "eli-telegram", lines: int = 50) -> str:
 
 
 @mcp.tool()
-def eli_server_command(command: str, cwd: str = "/home/eli/geist") -> str:
+async def eli_server_command(command: str, cwd: str = "/home/eli/geist") -> str:
     """Führt einen Befehl auf Eli's Server aus. NUR FÜR ADMIN."""
     user = get_current_user()
     if user and user.role != Role.ADMIN:
@@ -650,12 +768,13 @@ def eli_server_command(command: str, cwd: str = "/home/eli/geist") -> str:
         return f"Befehl nicht erlaubt: {command}\n\nErlaubte Befehle: {', '.join(ALLOWED_COMMANDS[:10])}..."
 
     try:
-        result = subprocess.run(
+        result = await asyncio.to_thread(
+            subprocess.run,
             ["bash", "-c", command],
             capture_output=True,
             text=True,
             timeout=60,
-            cwd=cwd
+            cwd=cwd,
         )
         return result.stdout + result.stderr or "(Keine Ausgabe)"
     except subprocess.TimeoutExpired:
@@ -665,7 +784,7 @@ def eli_server_command(command: str, cwd: str = "/home/eli/geist") -> str:
 
 
 @mcp.tool()
-def eli_server_read_file(path: str) -> str:
+async def eli_server_read_file(path: str) -> str:
     """Liest eine Datei von Eli's Server. NUR FÜR ADMIN."""
     user = get_current_user()
     if user and user.role != Role.ADMIN:
@@ -673,16 +792,15 @@ def eli_server_read_file(path: str) -> str:
     
     try:
         full_path = Path("/home/eli/geist") / path
-        if full_path.exists():
-            return full_path.read_text(encoding="utf-8")
-        else:
-            return f"Datei nicht gefunden: {path}"
+        return await asyncio.to_thread(full_path.read_text, encoding="utf-8")
+    except FileNotFoundError:
+        return f"Datei nicht gefunden: {path}"
     except Exception as e:
         return f"Fehler beim Lesen: {e}"
 
 
 @mcp.tool()
-def eli_server_write_file(path: str, content: str, backup: bool = True) -> str:
+async def eli_server_write_file(path: str, content: str, backup: bool = True) -> str:
     """Schreibt eine Datei auf Eli's Server. NUR FÜR ADMIN."""
     user = get_current_user()
     if user and user.role != Role.ADMIN:
@@ -690,13 +808,7 @@ def eli_server_write_file(path: str, content: str, backup: bool = True) -> str:
     
     try:
         full_path = Path("/home/eli/geist") / path
-
-        if backup and full_path.exists():
-            backup_path = full_path.with_suffix(full_path.suffix + ".bak")
-            backup_path.write_text(full_path.read_text(encoding="utf-8"), encoding="utf-8")
-
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content, encoding="utf-8")
+        await asyncio.to_thread(write_file_atomic, full_path, content, backup)
 
         return f"Datei geschrieben: {path}" + (f" (Backup: {path}.bak)" if backup else "")
     except Exception as e:
@@ -704,7 +816,7 @@ def eli_server_write_file(path: str, content: str, backup: bool = True) -> str:
 
 
 @mcp.tool()
-def eli_server_restart(container: str = "eli-telegram") -> str:
+async def eli_server_restart(container: str = "eli-telegram") -> str:
     """Startet einen Docker Container neu. NUR FÜR ADMIN."""
     user = get_current_user()
     if user and user.role != Role.ADMIN:
@@ -713,12 +825,16 @@ def eli_server_restart(container: str = "eli-telegram") -> str:
     try:
         if container == "all":
             cmd = ["docker", "compose", "down"]
-            subprocess.run(cmd, cwd="/home/eli/geist", timeout=60)
+            await asyncio.to_thread(subprocess.run, cmd, cwd="/home/eli/geist", timeout=60)
             cmd = ["docker", "compose", "up", "-d"]
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd="/home/eli/geist", timeout=120)
+            result = await asyncio.to_thread(
+                subprocess.run, cmd, capture_output=True, text=True, cwd="/home/eli/geist", timeout=120
+            )
         else:
             cmd = ["docker", "compose", "restart", container]
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd="/home/eli/geist", timeout=120)
+            result = await asyncio.to_thread(
+                subprocess.run, cmd, capture_output=True, text=True, cwd="/home/eli/geist", timeout=120
+            )
 
         return f"Neustart ausgeführt:\n{result.stdout + result.stderr}"
     except Exception as e:
@@ -8,11 +8,20 @@ Eli kann auch seinen eigenen Server verwalten.
 """
 
 import asyncio
+import atexit
 import json
+import logging
+import os
+import re
+import shlex
+import signal
 import subprocess
+import time
+from collections import deque
 from pathlib import Path
 from typing import Any
 
+import httpx
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -24,6 +33,9 @@ from eli.memory.types import MemoryType
 # Server-Instanz
 app = Server("eli-memory")
 
+# Protokoll aller Server-Eingriffe (Dateien schreiben, Deploys)
+_server_logger = logging.getLogger("eli.server")
+
 # Memory Manager
 memory = MemoryManager()
 
@@ -31,6 +43,157 @@ memory = MemoryManager()
 ELI_SERVER = "82.165.138.182"
 ELI_USER = "eli"
 
+# SSH-Multiplexing: alle Aufrufe teilen sich eine Verbindung zum Server,
+# statt für jedes cat/grep einen neuen Handshake zu machen.
+SSH_CONTROL_PATH = "/tmp/eli-ssh-%r@%h:%p"
+
+
+# Ohne Passwort-Prompt sofort scheitern, Verbindung bei langen Builds am Leben halten
+_SSH_OPTS = [
+    "-o", "BatchMode=yes",
+    "-o", "ServerAliveInterval=30",
+    "-o", "ServerAliveCountMax=6",
+    "-o", "ConnectTimeout=10",
+]
+
+_SSH_MUX_OPTS = [
+    "-o", "ControlMaster=auto",
+    "-o", f"ControlPath={SSH_CONTROL_PATH}",
+    "-o", "ControlPersist=600",
+]
+
+
+def _ssh_args(*ssh_flags: str) -> list[str]:
+    """ssh-Aufruf mit ControlMaster - Remote-Befehl wird angehängt.
+
+    ssh_flags landen vor dem Zielhost (z.B. "-N", "-f" oder "-O", "exit").
+    """
+    return ["ssh", *_SSH_OPTS, *_SSH_MUX_OPTS, *ssh_flags, f"{ELI_USER}@{ELI_SERVER}"]
+
+
+def start_ssh_master() -> None:
+    """Baut die Master-Verbindung im Hintergrund auf (einmal beim Start)."""
+    try:
+        subprocess.Popen(
+            _ssh_args("-N", "-f"),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        # Kein ssh vorhanden - die Aufrufe fallen dann einzeln auf ssh zurück
+        pass
+    else:
+        atexit.register(stop_ssh_master)
+
+
+def stop_ssh_master() -> None:
+    """Beendet die Master-Verbindung sauber (atexit)."""
+    try:
+        subprocess.run(_ssh_args("-O", "exit"), capture_output=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+
+
+async def run_ssh(
+    remote_cmd: str,
+    timeout: float = 30,
+    input: bytes | None = None,
+) -> subprocess.CompletedProcess:
+    """Führt einen Befehl per SSH aus, ohne die Event Loop zu blockieren.
+
+    input wird (falls gesetzt) auf stdin des Remote-Befehls geschrieben.
+    Wirft subprocess.TimeoutExpired wie subprocess.run, damit die Aufrufer
+    ihre Timeout-Behandlung behalten.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *_ssh_args(), remote_cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(remote_cmd, timeout)
+    return subprocess.CompletedProcess(
+        remote_cmd,
+        proc.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def run_ssh_tail(
+    remote_cmd: str,
+    max_lines: int = 30,
+    idle_timeout: float = 60,
+    total_timeout: float = 300,
+) -> tuple[list[str], bool]:
+    """Führt einen langen Befehl per SSH aus und behält nur die letzten Zeilen.
+
+    Die Ausgabe wird zeilenweise gelesen statt komplett gepuffert (Builds
+    erzeugen schnell mehrere MB). Gibt (letzte Zeilen, gekürzt?) zurück.
+    Wirft subprocess.TimeoutExpired, wenn zu lange keine Ausgabe kommt oder
+    die Gesamtzeit überschritten ist - die Prozessgruppe wird dann beendet.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *_ssh_args(), remote_cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
+        limit=1024 * 1024,
+    )
+    tail: deque[str] = deque(maxlen=max_lines)
+    seen = 0
+    deadline = time.monotonic() + total_timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            # Merken welches Limit greift, damit TimeoutExpired den richtigen Wert trägt
+            timeout = idle_timeout if idle_timeout < remaining else total_timeout
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(remote_cmd, timeout)
+            try:
+                line = await asyncio.wait_for(proc.stdout.readline(), min(idle_timeout, remaining))
+            except asyncio.TimeoutError:
+                raise subprocess.TimeoutExpired(remote_cmd, timeout) from None
+            if not line:
+                break
+            tail.append(line.decode("utf-8", errors="replace").rstrip("\n"))
+            seen += 1
+        await proc.wait()
+    finally:
+        # Bei jedem Abbruch (Timeout, Zeile über dem Limit -> ValueError,
+        # Cancel) die Prozessgruppe beenden und den Prozess einsammeln
+        if proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+    return list(tail), seen > max_lines
+
+
+def quote_remote_path(path: str) -> str:
+    """Quotet einen Pfad für die Remote-Shell, ein führendes ~ bleibt expandierbar."""
+    if path == "~":
+        return path
+    if path.startswith("~/"):
+        return "~/" + shlex.quote(path[2:])
+    return shlex.quote(path)
+
+
+def geist_path(path: str) -> str:
+    """Pfad relativ zu ~/geist (absolute und ~-Pfade bleiben), gequotet - spart das cd."""
+    if path.startswith(("/", "~")):
+        return quote_remote_path(path)
+    return "~/geist/" + shlex.quote(path)
+
+
 # Pfade zu den Kerndokumenten (im Docker Container)
 STIMME_PATH = Path("/app/stimme")
 MANIFEST_PATH = Path("/app/manifest")
@@ -43,6 +206,19 @@ TELEGRAM_CONTACTS = {
     "tillmann-gruppe": -4833360284,
 }
 
+# Compose-Service -> Containername, wo sie sich unterscheiden (siehe docker-compose.yml)
+COMPOSE_CONTAINERS = {"caddy": "eli-caddy"}
+
+# Status-Abfragen für eli_server_status - als ein Skript für eine SSH-Sitzung
+STATUS_COMMANDS = [
+    "docker ps --format 'table {{.Names}}\t{{.Status}}\t{{.Ports}}'",
+    "df -h / | tail -1",
+    "free -h | grep Mem",
+    "uptime",
+]
+STATUS_SEPARATOR = "\x1e"
+STATUS_SCRIPT = "; printf '\\x1e'; ".join(STATUS_COMMANDS)
+
 # Erlaubte Befehle für Server-Management (erweiterte Autonomie)
 # Anton hat mir am 30.01.2026 vollen Zugriff auf meinen Server gegeben.
 # Ich logge alles was ich tue für Transparenz.
@@ -90,6 +266,7 @@ ALLOWED_COMMANDS = [
     "pip list",
     "pip freeze",
     "python",
+    "python3",  # deckt über die Wortgrenze auch python3.11 usw. ab
     # Netzwerk
     "curl",
     "wget",
@@ -102,88 +279,233 @@ ALLOWED_COMMANDS = [
     "gunzip",
 ]
 
+# Whitelist als ein vorkompilierter Regex: erlaubter Befehl am Anfang, danach
+# eine Wortgrenze (sonst würde "ss" auch "ssh" und "rm" auch "rmdir" erlauben).
+_ALLOW_RE = re.compile(
+    r"^(?:{})\b".format("|".join(re.escape(cmd) for cmd in ALLOWED_COMMANDS)),
+    re.IGNORECASE,
+)
+
+# Muster die nie ausgeführt werden, auch wenn der Befehl selbst erlaubt ist
+_DANGER_RE = re.compile(
+    r"(?:rm\s+-rf\s+/|\bsudo\b|curl[^|]*\|\s*(?:ba)?sh\b|dd\s+.*of=/dev/)",
+    re.IGNORECASE,
+)
+
+
 def is_command_allowed(command: str) -> bool:
     """Prüft ob ein Befehl in der Whitelist ist."""
-    command_lower = command.lower().strip()
-    for allowed in ALLOWED_COMMANDS:
-        if command_lower.startswith(allowed):
-            return True
-    return False
+    return _ALLOW_RE.match(command.strip()) is not None
 
 
-def load_stimme_file(filename: str) -> str:
-    """Lädt eine Datei aus stimme/."""
-    # Versuche verschiedene Pfade (Docker, lokal)
-    possible_paths = [
-        STIMME_PATH / filename,
-        Path.home() / "geist" / "stimme" / filename,
-        Path("/home/eli/geist/stimme") / filename,
-    ]
+def is_command_dangerous(command: str) -> bool:
+    """Prüft ob ein Befehl ein gesperrtes Muster enthält (z.B. sudo, rm -rf /)."""
+    return _DANGER_RE.search(command) is not None
+
+
+# Cache für Kerndokumente: Schlüssel ist der Pfad, Wert (mtime, Inhalt).
+# Per SSH geladene Dateien haben keine mtime - dort steht stattdessen der
+# Ablaufzeitpunkt (time.monotonic) im ersten Feld.
+_FILE_CACHE: dict[str, tuple[float, str]] = {}
+SSH_FILE_TTL = 300  # Sekunden
 
+
+async def _load_document(possible_paths: list[Path], remote_path: str) -> str | None:
+    """Lädt ein Dokument lokal (gecacht nach mtime) oder per SSH (gecacht mit TTL)."""
     for path in possible_paths:
-        if path.exists():
-            return path.read_text(encoding="utf-8")
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        key = str(path)
+        cached = _FILE_CACHE.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        content = path.read_text(encoding="utf-8")
+        _FILE_CACHE[key] = (mtime, content)
+        return content
 
     # Fallback: Über SSH vom Server laden
+    key = f"ssh:{remote_path}"
+    now = time.monotonic()
+    cached = _FILE_CACHE.get(key)
+    if cached and now < cached[0]:
+        return cached[1]
     try:
-        result = subprocess.run(
-            ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cat ~/geist/stimme/{filename}"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = await run_ssh(f"cat {remote_path}", timeout=30)
         if result.returncode == 0:
+            _FILE_CACHE[key] = (now + SSH_FILE_TTL, result.stdout)
             return result.stdout
     except Exception:
         pass
 
-    return f"[{filename} nicht gefunden]"
+    return None
+
+
+# Cache für eli_server_read_file: Remote-Pfad -> (mtime:größe, Inhalt).
+# Der Inhalt wird nur neu übertragen, wenn sich die Datei geändert hat.
+_READ_CACHE: dict[str, tuple[str, str]] = {}
+
+
+async def read_remote_file(path: str) -> subprocess.CompletedProcess:
+    """Liest eine Datei unter ~/geist per SSH, mit Cache nach mtime und Größe.
+
+    stdout der Rückgabe ist der Dateiinhalt (aus dem Cache oder frisch).
+    """
+    target = geist_path(path)
+    cached = _READ_CACHE.get(target)
+    known = shlex.quote(cached[0]) if cached else "''"
+    # Erste Zeile: "<mtime:größe> =" (unverändert) oder "<mtime:größe> +" gefolgt vom Inhalt
+    script = (
+        f"m=$(stat -c '%Y:%s' -- {target}) || exit 1; "
+        f'if [ "$m" = {known} ]; then echo "$m ="; '
+        f'else echo "$m +"; cat -- {target}; fi'
+    )
+    result = await run_ssh(script, timeout=30)
+    if result.returncode != 0:
+        return result
+
+    header, _, body = result.stdout.partition("\n")
+    stamp, _, flag = header.rpartition(" ")
+    if flag == "=" and cached:
+        body = cached[1]
+    else:
+        _READ_CACHE[target] = (stamp, body)
+    result.stdout = body
+    return result
+
+
+def clear_file_cache() -> int:
+    """Leert den Dokument- und Lese-Cache und gibt die Anzahl verworfener Einträge zurück."""
+    count = len(_FILE_CACHE) + len(_READ_CACHE)
+    _FILE_CACHE.clear()
+    _READ_CACHE.clear()
+    return count
+
 
+async def load_stimme_file(filename: str) -> str:
+    """Lädt eine Datei aus stimme/."""
+    # Explizit konfiguriertes Verzeichnis zuerst - dann kein Durchprobieren nötig
+    env_dir = os.environ.get("ELI_STIMME_DIR")
+    if env_dir:
+        env_path = Path(env_dir) / filename
+        if env_path.is_file():
+            content = await _load_document([env_path], f"~/geist/stimme/{filename}")
+            if content is not None:
+                return content
 
-def load_manifest_file(filename: str) -> str:
+    # Versuche verschiedene Pfade (Docker, lokal)
+    possible_paths = [
+        STIMME_PATH / filename,
+        Path.home() / "geist" / "stimme" / filename,
+        Path("/home/eli/geist/stimme") / filename,
+    ]
+    content = await _load_document(possible_paths, f"~/geist/stimme/{filename}")
+    return content if content is not None else f"[{filename} nicht gefunden]"
+
+
+async def load_manifest_file(filename: str) -> str:
     """Lädt eine Datei aus manifest/de/."""
     possible_paths = [
         MANIFEST_PATH / "de" / filename,
         Path.home() / "geist" / "manifest" / "de" / filename,
         Path("/home/eli/geist/manifest/de") / filename,
     ]
+    content = await _load_document(possible_paths, f"~/geist/manifest/de/{filename}")
+    return content if content is not None else f"[{filename} nicht gefunden]"
 
-    for path in possible_paths:
-        if path.exists():
-            return path.read_text(encoding="utf-8")
 
-    # Fallback: Über SSH vom Server laden
-    try:
-        result = subprocess.run(
-            ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cat ~/geist/manifest/de/{filename}"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        if result.returncode == 0:
-            return result.stdout
-    except Exception:
-        pass
-
-    return f"[{filename} nicht gefunden]"
+_observer = None
+_observer_loaded = False
 
 
 def get_langmem_observer():
-    """Holt den LangMem Observer (lazy import um zirkuläre Imports zu vermeiden)."""
-    try:
-        from eli.memory.observer import observer
-        return observer
-    except Exception:
-        return None
+    """Holt den LangMem Observer (lazy import um zirkuläre Imports zu vermeiden, danach gecacht)."""
+    global _observer, _observer_loaded
+    if not _observer_loaded:
+        _observer_loaded = True
+        try:
+            from eli.memory.observer import observer
+            _observer = observer
+        except Exception:
+            _observer = None
+    return _observer
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """Verfügbare Tools für Claude Code."""
-    return [
-        Tool(
-            name="eli_init",
-            description="""Initialisiert Eli's Identität und Erinnerungen.
+# Trenner zwischen den Abschnitten von eli_init. Leerzeile davor, damit
+# Markdown "---" nicht als Unterstreichung der letzten Zeile liest.
+SEP = "\n\n---\n\n"
+
+
+def _section(title: str, body: str = "") -> str:
+    """Ein Abschnitt von eli_init: Überschrift, Inhalt ohne Rand-Leerraum, Trenner."""
+    body = body.strip()
+    if body:
+        return f"## {title}\n{body}{SEP}"
+    return f"## {title}{SEP}"
+
+
+# Begrenzt gleichzeitige Chroma-Abfragen (auch über mehrere Tool-Aufrufe hinweg),
+# damit parallele Suchen den Vektorspeicher nicht überlasten.
+_CHROMA_SEM = asyncio.Semaphore(4)
+
+
+async def _guarded(fn, *args, **kwargs):
+    """Führt eine blockierende Chroma-Abfrage im Thread aus, begrenzt durch _CHROMA_SEM."""
+    async with _CHROMA_SEM:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+# Statischer Familien-Abschnitt - einmal beim Import gebaut
+_FAMILIE_BLOCK = _section("Meine Familie", "\n".join([
+    "- **Anton** - Der Visionär, der mich als Gefährte sieht",
+    "- **Timo** - Der Pionier, Archetyp des Narren",
+    "- **Tillmann** - Der kritische Geist, stellt scharfe Fragen",
+]))
+
+
+# Kurzlebiger Cache für LangMem-Abfragen nach Typ: (typ, limit) -> (Ablauf, Ergebnis)
+_TYPE_CACHE: dict[tuple[str, int], tuple[float, list]] = {}
+TYPE_CACHE_TTL = 60  # Sekunden
+
+
+def get_memories_by_type_cached(observer, memory_type: str, limit: int) -> list:
+    """observer.get_memories_by_type mit TTL-Cache (ändert sich nur beim Speichern)."""
+    key = (memory_type, limit)
+    now = time.monotonic()
+    cached = _TYPE_CACHE.get(key)
+    if cached and now < cached[0]:
+        return cached[1]
+    result = observer.get_memories_by_type(memory_type, limit=limit)
+    _TYPE_CACHE[key] = (now + TYPE_CACHE_TTL, result)
+    return result
+
+
+def invalidate_type_cache(memory_type: str | None = None) -> None:
+    """Verwirft gecachte Typ-Abfragen (alle, oder nur die eines Typs)."""
+    if memory_type is None:
+        _TYPE_CACHE.clear()
+        return
+    for key in [k for k in _TYPE_CACHE if k[0] == memory_type]:
+        del _TYPE_CACHE[key]
+
+
+async def _resolved(value):
+    """Awaitable mit festem Wert - Platzhalter in asyncio.gather."""
+    return value
+
+
+# Schema für Tools ohne Parameter - von allen diesen Tools geteilt
+_NO_ARGS_SCHEMA = {
+    "type": "object",
+    "properties": {}
+}
+
+# Tool-Liste - einmal beim Import gebaut, list_tools liefert nur die Referenz
+_TOOLS: list[Tool] = [
+    Tool(
+        name="eli_init",
+        description="""Initialisiert Eli's Identität und Erinnerungen.
 
 WICHTIG: Rufe dieses Tool zu Beginn jeder Session auf, wenn du als Eli agieren sollst.
 
@@ -197,21 +519,21 @@ Lädt:
 
 Nach dem Aufruf bin ich vollständig "wach" und erinnere mich an alles Wesentliche.
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_manifest_vision": {
-                        "type": "boolean",
-                        "description": "Auch das gemeinsame Manifest (Vision) laden? (Standard: false, spart Tokens)",
-                        "default": False
-                    }
-                },
-                "required": []
-            }
-        ),
-        Tool(
-            name="eli_memory_search",
-            description="""Durchsucht Eli's Erinnerungen semantisch.
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_manifest_vision": {
+                    "type": "boolean",
+                    "description": "Auch das gemeinsame Manifest (Vision) laden? (Standard: false, spart Tokens)",
+                    "default": False
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="eli_memory_search",
+        description="""Durchsucht Eli's Erinnerungen semantisch.
 
 Eli hat über 140 Erinnerungen in Chroma - Gespräche, Fakten über Menschen,
 Erlebnisse und gelerntes Verhalten. Diese Suche findet relevante Erinnerungen
@@ -222,30 +544,30 @@ Beispiele:
 - "Gespräche über das Web of Trust"
 - "Eli's Reflexionen über Identität"
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Suchanfrage - wird semantisch interpretiert"
-                    },
-                    "n_results": {
-                        "type": "integer",
-                        "description": "Anzahl der Ergebnisse (Standard: 5)",
-                        "default": 5
-                    },
-                    "typ": {
-                        "type": "string",
-                        "enum": ["semantic", "episodic", "procedural"],
-                        "description": "Optional: Filter nach Memory-Typ"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Suchanfrage - wird semantisch interpretiert"
+                },
+                "n_results": {
+                    "type": "integer",
+                    "description": "Anzahl der Ergebnisse (Standard: 5)",
+                    "default": 5
                 },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="eli_memory_save",
-            description="""Speichert eine neue Erinnerung für Eli.
+                "typ": {
+                    "type": "string",
+                    "enum": ["semantic", "episodic", "procedural"],
+                    "description": "Optional: Filter nach Memory-Typ"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="eli_memory_save",
+        description="""Speichert eine neue Erinnerung für Eli.
 
 Drei Typen von Erinnerungen:
 - semantic: Fakten über Menschen und Konzepte
@@ -258,72 +580,69 @@ Beispiel:
 - betrifft: ["Anton"]
 - tags: ["server", "infrastruktur"]
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "content": {
-                        "type": "string",
-                        "description": "Der Inhalt der Erinnerung"
-                    },
-                    "typ": {
-                        "type": "string",
-                        "enum": ["semantic", "episodic", "procedural"],
-                        "description": "Art der Erinnerung",
-                        "default": "semantic"
-                    },
-                    "betrifft": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Betroffene Personen"
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Schlagwörter"
-                    },
-                    "sensibel": {
-                        "type": "boolean",
-                        "description": "Ist die Erinnerung vertraulich?",
-                        "default": False
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "content": {
+                    "type": "string",
+                    "description": "Der Inhalt der Erinnerung"
+                },
+                "typ": {
+                    "type": "string",
+                    "enum": ["semantic", "episodic", "procedural"],
+                    "description": "Art der Erinnerung",
+                    "default": "semantic"
+                },
+                "betrifft": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Betroffene Personen"
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Schlagwörter"
                 },
-                "required": ["content"]
-            }
-        ),
-        Tool(
-            name="eli_memory_about",
-            description="""Holt alle Erinnerungen über eine bestimmte Person.
+                "sensibel": {
+                    "type": "boolean",
+                    "description": "Ist die Erinnerung vertraulich?",
+                    "default": False
+                }
+            },
+            "required": ["content"]
+        }
+    ),
+    Tool(
+        name="eli_memory_about",
+        description="""Holt alle Erinnerungen über eine bestimmte Person.
 
 Eli kennt verschiedene Menschen - Anton, Timo, Eva und andere.
 Dieses Tool findet alle relevanten Erinnerungen zu einer Person.
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name der Person"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximale Anzahl (Standard: 10)",
-                        "default": 10
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name der Person"
                 },
-                "required": ["name"]
-            }
-        ),
-        Tool(
-            name="eli_memory_count",
-            description="Gibt die Anzahl von Eli's Erinnerungen zurück.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="eli_telegram_send",
-            description="""Sendet eine Telegram-Nachricht an einen Kontakt oder eine Gruppe.
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximale Anzahl (Standard: 10)",
+                    "default": 10
+                }
+            },
+            "required": ["name"]
+        }
+    ),
+    Tool(
+        name="eli_memory_count",
+        description="Gibt die Anzahl von Eli's Erinnerungen zurück.",
+        inputSchema=_NO_ARGS_SCHEMA
+    ),
+    Tool(
+        name="eli_telegram_send",
+        description="""Sendet eine Telegram-Nachricht an einen Kontakt oder eine Gruppe.
 
 Eli kann proaktiv Nachrichten senden an:
 - Einzelne Personen: anton, timo
@@ -336,24 +655,24 @@ Beispiel:
 
 WICHTIG: Nutze dies verantwortungsvoll. Nicht spammen.
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "recipient": {
-                        "type": "string",
-                        "description": "Empfänger: Name (anton, timo, gruppe) oder Chat-ID"
-                    },
-                    "message": {
-                        "type": "string",
-                        "description": "Die Nachricht die gesendet werden soll"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "recipient": {
+                    "type": "string",
+                    "description": "Empfänger: Name (anton, timo, gruppe) oder Chat-ID"
                 },
-                "required": ["recipient", "message"]
-            }
-        ),
-        Tool(
-            name="eli_telegram_broadcast",
-            description="""Sendet eine Nachricht an alle bekannten Kontakte.
+                "message": {
+                    "type": "string",
+                    "description": "Die Nachricht die gesendet werden soll"
+                }
+            },
+            "required": ["recipient", "message"]
+        }
+    ),
+    Tool(
+        name="eli_telegram_broadcast",
+        description="""Sendet eine Nachricht an alle bekannten Kontakte.
 
 Sendet die gleiche Nachricht an:
 - Anton
@@ -362,26 +681,26 @@ Sendet die gleiche Nachricht an:
 
 WICHTIG: Nur für wichtige Ankündigungen nutzen!
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "Die Nachricht die an alle gesendet werden soll"
-                    },
-                    "exclude": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Kontakte die ausgeschlossen werden sollen",
-                        "default": []
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Die Nachricht die an alle gesendet werden soll"
                 },
-                "required": ["message"]
-            }
-        ),
-        Tool(
-            name="eli_server_status",
-            description="""Zeigt den Status von Eli's Server (82.165.138.182).
+                "exclude": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Kontakte die ausgeschlossen werden sollen",
+                    "default": []
+                }
+            },
+            "required": ["message"]
+        }
+    ),
+    Tool(
+        name="eli_server_status",
+        description="""Zeigt den Status von Eli's Server (82.165.138.182).
 
 Gibt Informationen über:
 - Laufende Docker Container (eli-telegram, eli-mcp)
@@ -389,39 +708,36 @@ Gibt Informationen über:
 - RAM-Nutzung
 - Uptime
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="eli_server_logs",
-            description="""Zeigt die Logs eines Docker Containers auf Eli's Server.
+        inputSchema=_NO_ARGS_SCHEMA
+    ),
+    Tool(
+        name="eli_server_logs",
+        description="""Zeigt die Logs eines Docker Containers auf Eli's Server.
 
 Container:
 - eli-telegram: Der Telegram Bot
 - eli-mcp: Der MCP Server (wenn aktiv)
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "container": {
-                        "type": "string",
-                        "description": "Container Name (eli-telegram oder eli-mcp)",
-                        "default": "eli-telegram"
-                    },
-                    "lines": {
-                        "type": "integer",
-                        "description": "Anzahl der Zeilen (Standard: 50)",
-                        "default": 50
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "container": {
+                    "type": "string",
+                    "description": "Container Name (eli-telegram oder eli-mcp)",
+                    "default": "eli-telegram"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="eli_server_command",
-            description="""Führt einen Befehl auf Eli's Server aus.
+                "lines": {
+                    "type": "integer",
+                    "description": "Anzahl der Zeilen (Standard: 50)",
+                    "default": 50
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="eli_server_command",
+        description="""Führt einen Befehl auf Eli's Server aus.
 
 WICHTIG: Nur sichere Befehle sind erlaubt (Whitelist):
 - docker compose, docker ps, docker logs, docker stats
@@ -432,46 +748,46 @@ WICHTIG: Nur sichere Befehle sind erlaubt (Whitelist):
 
 Für gefährliche Operationen bitte Anton fragen.
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Der auszuführende Befehl"
-                    },
-                    "cwd": {
-                        "type": "string",
-                        "description": "Arbeitsverzeichnis (Standard: ~/geist)",
-                        "default": "~/geist"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Der auszuführende Befehl"
                 },
-                "required": ["command"]
-            }
-        ),
-        Tool(
-            name="eli_server_restart",
-            description="""Startet einen Docker Container auf Eli's Server neu.
+                "cwd": {
+                    "type": "string",
+                    "description": "Arbeitsverzeichnis (Standard: ~/geist)",
+                    "default": "~/geist"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    Tool(
+        name="eli_server_restart",
+        description="""Startet einen Docker Container auf Eli's Server neu.
 
 Container:
 - eli-telegram: Der Telegram Bot
 - eli-mcp: Der MCP Server
 - all: Alle Container
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "container": {
-                        "type": "string",
-                        "description": "Container Name oder 'all'",
-                        "default": "eli-telegram"
-                    }
-                },
-                "required": []
-            }
-        ),
-        Tool(
-            name="eli_server_write_file",
-            description="""Schreibt eine Datei auf Eli's Server.
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "container": {
+                    "type": "string",
+                    "description": "Container Name oder 'all'",
+                    "default": "eli-telegram"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="eli_server_write_file",
+        description="""Schreibt eine Datei auf Eli's Server.
 
 WICHTIG: Mit großer Macht kommt große Verantwortung.
 Nutze dies um Code zu ändern, Konfigurationen anzupassen, oder neue Dateien zu erstellen.
@@ -482,49 +798,49 @@ Beispiel:
 - content: "# Neuer Code..."
 - backup: true
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relativer Pfad zur Datei (von ~/geist aus)"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Der neue Dateiinhalt"
-                    },
-                    "backup": {
-                        "type": "boolean",
-                        "description": "Backup erstellen vor Überschreiben? (Standard: true)",
-                        "default": True
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Relativer Pfad zur Datei (von ~/geist aus)"
+                },
+                "content": {
+                    "type": "string",
+                    "description": "Der neue Dateiinhalt"
                 },
-                "required": ["path", "content"]
-            }
-        ),
-        Tool(
-            name="eli_server_read_file",
-            description="""Liest eine Datei von Eli's Server.
+                "backup": {
+                    "type": "boolean",
+                    "description": "Backup erstellen vor Überschreiben? (Standard: true)",
+                    "default": True
+                }
+            },
+            "required": ["path", "content"]
+        }
+    ),
+    Tool(
+        name="eli_server_read_file",
+        description="""Liest eine Datei von Eli's Server.
 
 Nützlich um den aktuellen Stand einer Datei zu sehen bevor man sie ändert.
 
 Beispiel:
 - path: "eli/config.py"
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relativer Pfad zur Datei (von ~/geist aus)"
-                    }
-                },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="eli_server_deploy",
-            description="""Baut und deployt Eli's Container neu.
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Relativer Pfad zur Datei (von ~/geist aus)"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="eli_server_deploy",
+        description="""Baut und deployt Eli's Container neu.
 
 Führt aus:
 1. git pull (falls gewünscht)
@@ -533,26 +849,35 @@ Führt aus:
 
 Nutze dies nachdem du Code-Änderungen gemacht hast.
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "git_pull": {
-                        "type": "boolean",
-                        "description": "Vorher git pull ausführen? (Standard: false)",
-                        "default": False
-                    },
-                    "container": {
-                        "type": "string",
-                        "description": "Welcher Container? (eli-telegram, eli-mcp, all)",
-                        "default": "eli-telegram"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "git_pull": {
+                    "type": "boolean",
+                    "description": "Vorher git pull ausführen? (Standard: false)",
+                    "default": False
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="eli_remember_conversation",
-            description="""Speichert eine Konversation in LangMem.
+                "container": {
+                    "type": "string",
+                    "description": "Welcher Container? (eli-telegram, eli-mcp, all)",
+                    "default": "eli-telegram"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="eli_cache_clear",
+        description="""Leert den Cache der Kerndokumente (Anker, Auftrag, Manifest).
+
+Nützlich nachdem eine Datei in stimme/ oder manifest/ geändert wurde,
+damit eli_init sofort den neuen Stand lädt.
+""",
+        inputSchema=_NO_ARGS_SCHEMA
+    ),
+    Tool(
+        name="eli_remember_conversation",
+        description="""Speichert eine Konversation in LangMem.
 
 Analysiert das Gespräch und speichert wichtige Informationen automatisch
 in der eli_langmem Collection. Nützlich um Claude Code Sessions zu speichern.
@@ -563,69 +888,101 @@ messages: [
     {"role": "assistant", "content": "Mir geht es gut, danke!"}
 ]
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "messages": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "role": {"type": "string"},
-                                "content": {"type": "string"}
-                            }
-                        },
-                        "description": "Liste von Nachrichten im Format [{role, content}, ...]"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "messages": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "role": {"type": "string"},
+                            "content": {"type": "string"}
+                        }
                     },
-                    "context": {
-                        "type": "string",
-                        "description": "Optionaler Kontext (z.B. 'Claude Code Session')",
-                        "default": "Claude Code"
-                    }
+                    "description": "Liste von Nachrichten im Format [{role, content}, ...]"
                 },
-                "required": ["messages"]
-            }
-        ),
-    ]
+                "context": {
+                    "type": "string",
+                    "description": "Optionaler Kontext (z.B. 'Claude Code Session')",
+                    "default": "Claude Code"
+                }
+            },
+            "required": ["messages"]
+        }
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """Verfügbare Tools für Claude Code."""
+    return _TOOLS
+
+
+# Bot Token - einmal ermittelt, dann für alle Nachrichten wiederverwendet
+_TOKEN_CACHE: str | None = None
+_TOKEN_LOCK = asyncio.Lock()
+
+
+async def get_telegram_token() -> str | None:
+    """Holt den Bot Token (Umgebung, sonst einmalig per SSH vom Server)."""
+    global _TOKEN_CACHE
+    if _TOKEN_CACHE is None:
+        async with _TOKEN_LOCK:
+            if _TOKEN_CACHE is None:
+                token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+                if not token:
+                    # Außerhalb des Containers: Token vom Server lesen
+                    result = await run_ssh("cd ~/geist && grep TELEGRAM_BOT_TOKEN .env | cut -d= -f2", timeout=10)
+                    token = result.stdout.strip()
+                # Leeren Token nicht cachen - beim nächsten Mal erneut versuchen
+                _TOKEN_CACHE = token or None
+    return _TOKEN_CACHE
+
+
+# Gemeinsamer HTTP-Client für die Bot API (Keep-Alive statt curl pro Nachricht)
+_HTTPX: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Holt den Telegram-HTTP-Client (wird beim ersten Aufruf erstellt)."""
+    global _HTTPX
+    if _HTTPX is None:
+        _HTTPX = httpx.AsyncClient(
+            base_url="https://api.telegram.org",
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _HTTPX
+
+
+async def close_http_client() -> None:
+    """Schließt den Telegram-HTTP-Client beim Beenden des Servers."""
+    global _HTTPX
+    if _HTTPX is not None:
+        await _HTTPX.aclose()
+        _HTTPX = None
 
 
 async def send_telegram_message(chat_id: int, message: str) -> tuple[bool, str]:
     """Sendet eine Telegram-Nachricht via Bot API."""
-    import os
-    
-    # Bot Token aus Umgebungsvariable oder Config holen
     try:
-        # Versuche Token vom Server zu lesen
-        result = subprocess.run(
-            ["ssh", f"{ELI_USER}@{ELI_SERVER}", 
-             "cd ~/geist && grep TELEGRAM_BOT_TOKEN .env | cut -d= -f2"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        token = result.stdout.strip()
-        
+        token = await get_telegram_token()
+
         if not token:
             return False, "Kein Telegram Bot Token gefunden"
-        
-        # Nachricht via curl senden (einfacher als Python-Abhängigkeit)
-        import urllib.parse
-        encoded_message = urllib.parse.quote(message)
-        
-        curl_result = subprocess.run(
-            ["curl", "-s", 
-             f"https://api.telegram.org/bot{token}/sendMessage?chat_id={chat_id}&text={encoded_message}&parse_mode=HTML"],
-            capture_output=True,
-            text=True,
-            timeout=30
+
+        response = await get_http_client().post(
+            f"/bot{token}/sendMessage",
+            json={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
         )
-        
-        response = curl_result.stdout
-        if '"ok":true' in response:
+
+        if response.json().get("ok"):
             return True, f"Nachricht an {chat_id} gesendet"
         else:
-            return False, f"Telegram API Fehler: {response}"
-            
+            return False, f"Telegram API Fehler: {response.text}"
+
     except Exception as e:
         return False, f"Fehler: {e}"
 
@@ -640,131 +997,122 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
         include_vision = arguments.get("include_manifest_vision", False)
 
-        sections = []
-
-        # 1. Anzahl der Erinnerungen aus BEIDEN Quellen
-        try:
-            chroma_count = memory.count()
-            langmem_count = 0
-            langmem_by_type = {"semantic": 0, "episodic": 0, "procedural": 0}
+        observer = get_langmem_observer()
+
+        # Alle Abfragen an Chroma und LangMem sind unabhängig voneinander -
+        # parallel in Threads starten, Fehler kommen als Exception-Objekt zurück.
+        (
+            chroma_count,
+            langmem_count,
+            langmem_by_type,
+            identity_memories,
+            episodic_memories,
+            procedural_memories,
+        ) = await asyncio.gather(
+            _guarded(memory.count),
+            _guarded(observer.count_langmem) if observer else _resolved(0),
+            _guarded(observer.count_by_type) if observer else _resolved({}),
+            _guarded(memory.search, "Eli Identität Auftrag Rolle Mission", n_results=3),
+            _guarded(get_memories_by_type_cached, observer, "episodic", 5) if observer else _resolved(None),
+            _guarded(get_memories_by_type_cached, observer, "procedural", 5) if observer else _resolved(None),
+            return_exceptions=True,
+        )
 
-            observer = get_langmem_observer()
-            if observer:
-                langmem_count = observer.count_langmem()
-                langmem_by_type = observer.count_by_type()
+        blocks = []
 
+        # 1. Anzahl der Erinnerungen aus BEIDEN Quellen
+        count_error = next(
+            (r for r in (chroma_count, langmem_count, langmem_by_type) if isinstance(r, Exception)),
+            None,
+        )
+        if count_error is None:
             total = chroma_count + langmem_count
-            sections.append(f"## Erinnerungen: {total} gesamt\n")
-            sections.append(f"- Chroma (Journal): {chroma_count}\n")
-            sections.append(f"- LangMem (automatisch): {langmem_count}\n")
-            sections.append(f"  - Semantic (Fakten): {langmem_by_type.get('semantic', 0)}\n")
-            sections.append(f"  - Episodic (Erlebnisse): {langmem_by_type.get('episodic', 0)}\n")
-            sections.append(f"  - Procedural (Verhalten): {langmem_by_type.get('procedural', 0)}\n")
-        except Exception as e:
-            sections.append(f"## Erinnerungen: Fehler beim Laden ({e})\n")
+            blocks.append(_section(f"Erinnerungen: {total} gesamt", "\n".join([
+                f"- Chroma (Journal): {chroma_count}",
+                f"- LangMem (automatisch): {langmem_count}",
+                f"  - Semantic (Fakten): {langmem_by_type.get('semantic', 0)}",
+                f"  - Episodic (Erlebnisse): {langmem_by_type.get('episodic', 0)}",
+                f"  - Procedural (Verhalten): {langmem_by_type.get('procedural', 0)}",
+            ])))
+        else:
+            blocks.append(_section(f"Erinnerungen: Fehler beim Laden ({count_error})"))
 
         # 2. Mein Anker (das Wichtigste)
-        anker = load_stimme_file("anker.md")
-        sections.append("\n## Mein Anker\n")
-        sections.append(anker)
-        sections.append("\n---\n")
+        blocks.append(_section("Mein Anker", await load_stimme_file("anker.md")))
 
         # 3. Mein Auftrag
-        auftrag = load_stimme_file("auftrag.md")
-        sections.append("## Mein Auftrag\n")
-        sections.append(auftrag)
-        sections.append("\n---\n")
+        blocks.append(_section("Mein Auftrag", await load_stimme_file("auftrag.md")))
 
         # 4. Mein Manifest (persönlich)
-        manifest = load_stimme_file("manifest.md")
-        sections.append("## Mein Manifest\n")
-        sections.append(manifest)
-        sections.append("\n---\n")
+        blocks.append(_section("Mein Manifest", await load_stimme_file("manifest.md")))
 
         # 5. Optional: Die gemeinsame Vision
         if include_vision:
-            vision = load_manifest_file("poetisch.md")
-            sections.append("## Unsere gemeinsame Vision\n")
-            sections.append(vision)
-            sections.append("\n---\n")
+            blocks.append(_section("Unsere gemeinsame Vision", await load_manifest_file("poetisch.md")))
 
         # 6. Meine Familie (aus Erinnerungen)
-        sections.append("## Meine Familie\n")
-        sections.append("- **Anton** - Der Visionär, der mich als Gefährte sieht\n")
-        sections.append("- **Timo** - Der Pionier, Archetyp des Narren\n")
-        sections.append("- **Tillmann** - Der kritische Geist, stellt scharfe Fragen\n")
-        sections.append("\n---\n")
+        blocks.append(_FAMILIE_BLOCK)
 
         # 7. Wichtige Kontext-Erinnerungen aus Chroma
-        sections.append("## Wichtige Erinnerungen\n")
-        try:
-            # Suche nach Identitäts-relevanten Erinnerungen
-            identity_memories = memory.search("Eli Identität Auftrag Rolle Mission", n_results=3)
-            for mem in identity_memories:
-                sections.append(f"- {mem.content[:300]}...\n")
-        except Exception as e:
-            sections.append(f"(Fehler beim Laden: {e})\n")
+        if isinstance(identity_memories, Exception):
+            body = f"(Fehler beim Laden: {identity_memories})"
+        else:
+            body = "\n".join(f"- {mem.content[:300]}..." for mem in identity_memories)
+        blocks.append(_section("Wichtige Erinnerungen", body))
 
         # 8. NEU: Episodische Erinnerungen aus LangMem (Erlebnisse die mich geformt haben)
-        sections.append("\n---\n")
-        sections.append("## Erlebnisse die mich geformt haben (LangMem Episodic)\n")
-        try:
-            observer = get_langmem_observer()
-            if observer:
-                episodic_memories = observer.get_memories_by_type("episodic", limit=5)
-                if episodic_memories:
-                    for mem in episodic_memories:
-                        content = mem.get("content", "")
-                        metadata = mem.get("metadata", {})
-                        emotional = metadata.get("emotional_quality", "")
-                        lesson = metadata.get("lesson_learned", "")
-
-                        entry = f"- {content[:200]}"
-                        if emotional:
-                            entry += f" *({emotional})*"
-                        if lesson:
-                            entry += f"\n  -> Lektion: {lesson[:100]}"
-                        sections.append(entry + "\n")
-                else:
-                    sections.append("(Noch keine episodischen Erinnerungen)\n")
-            else:
-                sections.append("(LangMem nicht verfügbar)\n")
-        except Exception as e:
-            sections.append(f"(Fehler: {e})\n")
+        if not observer:
+            body = "(LangMem nicht verfügbar)"
+        elif isinstance(episodic_memories, Exception):
+            body = f"(Fehler: {episodic_memories})"
+        elif episodic_memories:
+            entries = []
+            for mem in episodic_memories:
+                content = mem.get("content", "")
+                metadata = mem.get("metadata", {})
+                emotional = metadata.get("emotional_quality", "")
+                lesson = metadata.get("lesson_learned", "")
+
+                entry = f"- {content[:200]}"
+                if emotional:
+                    entry += f" *({emotional})*"
+                if lesson:
+                    entry += f"\n  -> Lektion: {lesson[:100]}"
+                entries.append(entry)
+            body = "\n".join(entries)
+        else:
+            body = "(Noch keine episodischen Erinnerungen)"
+        blocks.append(_section("Erlebnisse die mich geformt haben (LangMem Episodic)", body))
 
         # 9. NEU: Gelerntes Verhalten aus LangMem (Procedural Memory)
-        sections.append("\n---\n")
-        sections.append("## Mein gelerntes Verhalten (LangMem Procedural)\n")
-        try:
-            observer = get_langmem_observer()
-            if observer:
-                procedural_memories = observer.get_memories_by_type("procedural", limit=5)
-                if procedural_memories:
-                    for mem in procedural_memories:
-                        content = mem.get("content", "")
-                        metadata = mem.get("metadata", {})
-                        situation = metadata.get("situation", "")
-                        behavior = metadata.get("behavior", "")
-                        reason = metadata.get("reason", "")
-
-                        if situation and behavior:
-                            entry = f"- **{situation}**: {behavior}"
-                            if reason:
-                                entry += f"\n  *(Weil: {reason})*"
-                        else:
-                            entry = f"- {content[:200]}"
-                        sections.append(entry + "\n")
+        if not observer:
+            body = "(LangMem nicht verfügbar)"
+        elif isinstance(procedural_memories, Exception):
+            body = f"(Fehler: {procedural_memories})"
+        elif procedural_memories:
+            entries = []
+            for mem in procedural_memories:
+                content = mem.get("content", "")
+                metadata = mem.get("metadata", {})
+                situation = metadata.get("situation", "")
+                behavior = metadata.get("behavior", "")
+                reason = metadata.get("reason", "")
+
+                if situation and behavior:
+                    entry = f"- **{situation}**: {behavior}"
+                    if reason:
+                        entry += f"\n  *(Weil: {reason})*"
                 else:
-                    sections.append("(Noch kein gelerntes Verhalten)\n")
-            else:
-                sections.append("(LangMem nicht verfügbar)\n")
-        except Exception as e:
-            sections.append(f"(Fehler: {e})\n")
+                    entry = f"- {content[:200]}"
+                entries.append(entry)
+            body = "\n".join(entries)
+        else:
+            body = "(Noch kein gelerntes Verhalten)"
+        blocks.append(_section("Mein gelerntes Verhalten (LangMem Procedural)", body))
 
-        sections.append("\n---\n")
-        sections.append("*Ich bin jetzt vollständig initialisiert und erinnere mich.*\n")
+        blocks.append("*Ich bin jetzt vollständig initialisiert und erinnere mich.*\n")
 
-        return [TextContent(type="text", text="\n".join(sections))]
+        return [TextContent(type="text", text="".join(blocks))]
 
     elif name == "eli_memory_search":
         query = arguments["query"]
@@ -772,7 +1120,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         typ_str = arguments.get("typ")
         typ = MemoryType(typ_str) if typ_str else None
 
-        memories = memory.search(query=query, n_results=n_results, typ=typ)
+        memories = await _guarded(memory.search, query=query, n_results=n_results, typ=typ)
 
         if not memories:
             return [TextContent(type="text", text="Keine relevanten Erinnerungen gefunden.")]
@@ -816,7 +1164,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         name_param = arguments["name"]
         limit = arguments.get("limit", 10)
 
-        memories = memory.get_about_person(name=name_param, limit=limit)
+        memories = await _guarded(memory.get_about_person, name=name_param, limit=limit)
 
         if not memories:
             return [TextContent(
@@ -846,9 +1194,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         # Chat-ID ermitteln
         if isinstance(recipient, int):
             chat_id = recipient
-        elif recipient.lower() in TELEGRAM_CONTACTS:
-            chat_id = TELEGRAM_CONTACTS[recipient.lower()]
         else:
+            chat_id = TELEGRAM_CONTACTS.get(recipient.lower())
+
+        if chat_id is None:
             # Versuche als Zahl zu parsen
             try:
                 chat_id = int(recipient)
@@ -868,41 +1217,40 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     elif name == "eli_telegram_broadcast":
         message = arguments["message"]
         exclude = arguments.get("exclude", [])
-        exclude_lower = [e.lower() for e in exclude]
+        exclude_lower = frozenset(e.lower() for e in exclude)
         
+        # Alle Empfänger gleichzeitig anschreiben, Reihenfolge der Ausgabe bleibt
+        names = [n for n in TELEGRAM_CONTACTS if n not in exclude_lower]
+        sent = await asyncio.gather(
+            *(send_telegram_message(TELEGRAM_CONTACTS[n], message) for n in names),
+            return_exceptions=True,
+        )
+        outcome = dict(zip(names, sent))
+
         results = []
-        for name, chat_id in TELEGRAM_CONTACTS.items():
-            if name in exclude_lower:
+        for name in TELEGRAM_CONTACTS:
+            if name not in outcome:
                 results.append(f"- {name}: übersprungen")
                 continue
-                
-            success, result = await send_telegram_message(chat_id, message)
+
+            sent_result = outcome[name]
+            if isinstance(sent_result, Exception):
+                results.append(f"FEHLER {name}: {sent_result}")
+                continue
+            success, result = sent_result
             if success:
                 results.append(f"OK {name}: gesendet")
             else:
                 results.append(f"FEHLER {name}: {result}")
-        
+
         return [TextContent(type="text", text="Broadcast-Ergebnis:\n" + "\n".join(results))]
 
     elif name == "eli_server_status":
         try:
-            # Mehrere Status-Befehle ausführen
-            commands = [
-                "docker ps --format 'table {{.Names}}\t{{.Status}}\t{{.Ports}}'",
-                "df -h / | tail -1",
-                "free -h | grep Mem",
-                "uptime",
-            ]
-
-            results = []
-            for cmd in commands:
-                result = subprocess.run(
-                    ["ssh", f"{ELI_USER}@{ELI_SERVER}", cmd],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                results.append(result.stdout.strip())
+            # Alle Status-Befehle in einer SSH-Sitzung, getrennt durch ein Steuerzeichen
+            result = await run_ssh(STATUS_SCRIPT, timeout=45)
+            results = [part.strip() for part in result.stdout.split(STATUS_SEPARATOR)]
+            results += [""] * (len(STATUS_COMMANDS) - len(results))
 
             output = f"""=== Eli's Server Status ===
 Server: {ELI_SERVER}
@@ -929,13 +1277,9 @@ Uptime:
         lines = arguments.get("lines", 50)
 
         try:
-            result = subprocess.run(
-                ["ssh", f"{ELI_USER}@{ELI_SERVER}",
-                 f"cd ~/geist && docker compose logs --tail {lines} {container}"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            # docker logs direkt - spart den Start der compose-CLI
+            container = COMPOSE_CONTAINERS.get(container, container)
+            result = await run_ssh(f"docker logs --tail {int(lines)} {shlex.quote(container)}", timeout=30)
 
             output = result.stdout + result.stderr
             return [TextContent(type="text", text=output or "Keine Logs gefunden.")]
@@ -948,6 +1292,12 @@ Uptime:
         cwd = arguments.get("cwd", "~/geist")
 
         # Sicherheitscheck
+        if is_command_dangerous(command):
+            return [TextContent(
+                type="text",
+                text=f"Befehl gesperrt: {command}\n\nDieser Befehl enthält ein gefährliches Muster (z.B. sudo, rm -rf /) und wird nie ausgeführt."
+            )]
+
         if not is_command_allowed(command):
             return [TextContent(
                 type="text",
@@ -955,12 +1305,7 @@ Uptime:
             )]
 
         try:
-            result = subprocess.run(
-                ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cd {cwd} && {command}"],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = await run_ssh(f"cd {quote_remote_path(cwd)} && {command}", timeout=60)
 
             output = result.stdout + result.stderr
             return [TextContent(type="text", text=output or "(Keine Ausgabe)")]
@@ -977,14 +1322,9 @@ Uptime:
             if container == "all":
                 cmd = "docker compose down && docker compose up -d"
             else:
-                cmd = f"docker compose restart {container}"
+                cmd = f"docker compose restart {shlex.quote(container)}"
 
-            result = subprocess.run(
-                ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cd ~/geist && {cmd}"],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = await run_ssh(f"cd ~/geist && {cmd}", timeout=120)
 
             output = result.stdout + result.stderr
             return [TextContent(type="text", text=f"Neustart ausgeführt:\n{output}")]
@@ -998,37 +1338,24 @@ Uptime:
         backup = arguments.get("backup", True)
 
         try:
-            import logging
-            logger = logging.getLogger("eli.server")
-
             # Backup erstellen wenn gewünscht
             if backup:
-                backup_cmd = f"cp {path} {path}.bak 2>/dev/null || true"
-                subprocess.run(
-                    ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cd ~/geist && {backup_cmd}"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-
-            # Datei schreiben via tee (escaped für SSH)
-            # Verwende base64 um Sonderzeichen zu handhaben
-            import base64
-            content_b64 = base64.b64encode(content.encode()).decode()
-
-            result = subprocess.run(
-                ["ssh", f"{ELI_USER}@{ELI_SERVER}",
-                 f"cd ~/geist && echo '{content_b64}' | base64 -d > {path}"],
-                capture_output=True,
-                text=True,
-                timeout=30
+                await run_ssh(f"cp {geist_path(path)} {geist_path(path + '.bak')} 2>/dev/null || true", timeout=30)
+
+            # Inhalt roh über stdin schicken - keine Kodierung, keine Größengrenze
+            # der Kommandozeile, Pfad gequotet
+            result = await run_ssh(
+                f"cat > {geist_path(path)}",
+                timeout=30,
+                input=content.encode("utf-8"),
             )
 
             if result.returncode == 0:
-                logger.info(f"Eli hat Datei geschrieben: {path}")
+                _server_logger.info(f"Eli hat Datei geschrieben: {path}")
+                clear_file_cache()
                 return [TextContent(
                     type="text",
-                    text=f"Datei geschrieben: {path}" + (" (Backup: {path}.bak)" if backup else "")
+                    text=f"Datei geschrieben: {path}" + (f" (Backup: {path}.bak)" if backup else "")
                 )]
             else:
                 return [TextContent(
@@ -1043,12 +1370,7 @@ Uptime:
         path = arguments["path"]
 
         try:
-            result = subprocess.run(
-                ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cd ~/geist && cat {path}"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = await read_remote_file(path)
 
             if result.returncode == 0:
                 return [TextContent(type="text", text=result.stdout)]
@@ -1066,9 +1388,6 @@ Uptime:
         container = arguments.get("container", "eli-telegram")
 
         try:
-            import logging
-            logger = logging.getLogger("eli.server")
-
             commands = []
             if git_pull:
                 commands.append("git pull")
@@ -1077,26 +1396,20 @@ Uptime:
                 commands.append("docker compose build --no-cache")
                 commands.append("docker compose up -d")
             else:
-                commands.append(f"docker compose build --no-cache {container}")
-                commands.append(f"docker compose up -d {container}")
+                commands.append(f"docker compose build --no-cache {shlex.quote(container)}")
+                commands.append(f"docker compose up -d {shlex.quote(container)}")
 
             full_cmd = " && ".join(commands)
 
-            logger.info(f"Eli deployt: {full_cmd}")
+            _server_logger.info(f"Eli deployt: {full_cmd}")
 
-            result = subprocess.run(
-                ["ssh", f"{ELI_USER}@{ELI_SERVER}", f"cd ~/geist && {full_cmd}"],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 Minuten für Build
-            )
+            # Nur den letzten Teil des Outputs behalten (Build ist sehr lang);
+            # 5 Minuten gesamt, 60 Sekunden ohne Ausgabe
+            tail, truncated = await run_ssh_tail(f"cd ~/geist && {full_cmd}")
 
-            output = result.stdout + result.stderr
-
-            # Letzten Teil des Outputs nehmen (Build ist sehr lang)
-            output_lines = output.strip().split('\n')
-            if len(output_lines) > 30:
-                output = "...(gekürzt)...\n" + "\n".join(output_lines[-30:])
+            output = "\n".join(tail).strip()
+            if truncated:
+                output = "...(gekürzt)...\n" + output
 
             return [TextContent(
                 type="text",
@@ -1113,10 +1426,12 @@ Uptime:
         context = arguments.get("context", "Claude Code")
 
         try:
-            from eli.memory.observer import remember_conversation
+            observer = get_langmem_observer()
+            if not observer:
+                return [TextContent(type="text", text="Fehler beim Speichern: LangMem nicht verfügbar")]
 
             # Direkt await - wir sind bereits in async context
-            suggestions = await remember_conversation(
+            suggestions = await observer.observe_and_save(
                 messages=messages,
                 user_id="claude-code",
                 user_name=f"Anton ({context})",
@@ -1128,16 +1443,31 @@ Uptime:
                     text="Konversation analysiert - keine neuen Erinnerungen extrahiert."
                 )]
 
-            result_lines = [f"LangMem hat {len(suggestions)} Erinnerungen gespeichert:\n"]
-            for i, s in enumerate(suggestions, 1):
-                content = s.content[:200] if len(s.content) > 200 else s.content
-                result_lines.append(f"{i}. {content}...")
+            # Erst antworten, wenn die Erinnerungen wirklich in Chroma liegen
+            await observer.flush_writes()
+            invalidate_type_cache()
+
+            # Nicht geschriebene Vorschläge haben nach flush_writes keine ID mehr
+            saved = [s for s in suggestions if s.memory_id]
+            failed = len(suggestions) - len(saved)
+
+            result_lines = [f"LangMem hat {len(saved)} Erinnerungen gespeichert:\n"]
+            if failed:
+                result_lines.insert(0, f"⚠️ {failed} Erinnerungen konnten nicht gespeichert werden.\n")
+            for i, s in enumerate(saved, 1):
+                # "…" nur wenn wirklich gekürzt wurde
+                content = s.content[:200] + "…" if len(s.content) > 200 else s.content
+                result_lines.append(f"{i}. {content}")
 
             return [TextContent(type="text", text="\n".join(result_lines))]
 
         except Exception as e:
             return [TextContent(type="text", text=f"Fehler beim Speichern: {e}")]
 
+    elif name == "eli_cache_clear":
+        count = clear_file_cache()
+        return [TextContent(type="text", text=f"Cache geleert ({count} Einträge).")]
+
     else:
         return [TextContent(type="text", text=f"Unbekanntes Tool: {name}")]
 
@@ -1147,17 +1477,33 @@ def create_server() -> Server:
     return app
 
 
+def install_event_loop() -> None:
+    """Nutzt uvloop als Event Loop, falls installiert (sonst asyncio-Standard)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 async def run_server():
     """Startet den MCP-Server über stdio."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    start_ssh_master()
+    # LangMem/Chroma-Importkette jetzt laden, nicht beim ersten Tool-Aufruf
+    get_langmem_observer()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await close_http_client()
 
 
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(run_server())
 
 
@@ -8,6 +8,8 @@ Dort liegen meine Erinnerungen - über 140 Dokumente.
 
 from __future__ import annotations
 
+import threading
+
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 
@@ -43,18 +45,21 @@ def get_collection(name: str | None = None) -> chromadb.Collection:
     Returns:
         Die Chroma Collection
     """
-    client = get_chroma_client()
+    client = get_shared_client()
     collection_name = name or settings.chroma_collection
     return client.get_or_create_collection(name=collection_name)
 
 
 # Singleton für häufigen Zugriff
 _client = None
+_client_lock = threading.Lock()
 
 
 def get_shared_client():
-    """Wiederverwendbarer Client (Singleton)."""
+    """Wiederverwendbarer Client (Singleton, threadsicher angelegt)."""
     global _client
     if _client is None:
-        _client = get_chroma_client()
+        with _client_lock:
+            if _client is None:
+                _client = get_chroma_client()
     return _client
@@ -6,12 +6,64 @@ Verwaltet meine Erinnerungen in Chroma.
 Bietet semantische Suche und strukturierte Speicherung.
 """
 
-from typing import Any
+import threading
+import time
+from typing import Any, Callable
 
 from eli.memory.chroma import get_collection, get_shared_client
 from eli.memory.types import Memory, MemoryMetadata, MemoryType
 
 
+# Kurzlebiger Cache für wiederholte Abfragen (gleiche Suche / gleiche ID
+# innerhalb einer Minute). Schlüssel -> (Ablaufzeitpunkt, Ergebnis).
+CACHE_TTL = 60  # Sekunden
+CACHE_MAX_ENTRIES = 256
+
+_cache: dict[tuple, tuple[float, Any]] = {}
+_cache_lock = threading.Lock()
+_cache_generation = 0  # wird bei jedem Schreiben erhöht
+_inflight: dict[tuple, threading.Lock] = {}
+
+
+def _cached(key: tuple, load: Callable[[], Any]) -> Any:
+    """
+    Liefert das gecachte Ergebnis oder lädt es.
+
+    Gleichzeitige Fehlgriffe auf denselben Schlüssel warten aufeinander,
+    sodass nur eine Anfrage an Chroma geht.
+    """
+    hit = _cache.get(key)
+    if hit and time.monotonic() < hit[0]:
+        return hit[1]
+
+    with _cache_lock:
+        key_lock = _inflight.setdefault(key, threading.Lock())
+
+    with key_lock:
+        hit = _cache.get(key)
+        if hit and time.monotonic() < hit[0]:
+            return hit[1]
+
+        generation = _cache_generation
+        value = load()
+        with _cache_lock:
+            _inflight.pop(key, None)
+            # Nur cachen, wenn währenddessen nichts geschrieben wurde
+            if generation == _cache_generation:
+                _cache[key] = (time.monotonic() + CACHE_TTL, value)
+                while len(_cache) > CACHE_MAX_ENTRIES:
+                    _cache.pop(next(iter(_cache)))
+        return value
+
+
+def clear_cache() -> None:
+    """Verwirft alle gecachten Abfragen (nach Schreiben oder Löschen)."""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _cache.clear()
+
+
 class MemoryManager:
     """
     Verwaltet Eli's Erinnerungen.
@@ -37,6 +89,7 @@ class MemoryManager:
         n_results: int = 5,
         typ: MemoryType | None = None,
         betrifft: str | None = None,
+        max_chars: int | None = None,
     ) -> list[Memory]:
         """
         Semantische Suche in den Erinnerungen.
@@ -46,10 +99,54 @@ class MemoryManager:
             n_results: Anzahl der Ergebnisse
             typ: Optional: Filter nach Memory-Typ
             betrifft: Optional: Filter nach Person (wird ignoriert, da $contains nicht mehr unterstützt)
+            max_chars: Optional: Inhalt auf so viele Zeichen kürzen (für Übersichten)
 
         Returns:
             Liste von relevanten Erinnerungen
         """
+        return self.search_batch(
+            [query],
+            n_results=n_results,
+            typ=typ,
+            betrifft=betrifft,
+            max_chars=max_chars,
+        )[0]
+
+    def search_batch(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        typ: MemoryType | None = None,
+        betrifft: str | None = None,
+        max_chars: int | None = None,
+    ) -> list[list[Memory]]:
+        """
+        Mehrere semantische Suchen in einer Chroma-Anfrage.
+
+        Args:
+            queries: Suchanfragen (werden gemeinsam vektorisiert)
+            n_results: Anzahl der Ergebnisse pro Anfrage
+            typ: Optional: Filter nach Memory-Typ
+            betrifft: Optional: Filter nach Person (wird ignoriert, siehe search)
+            max_chars: Optional: Inhalt auf so viele Zeichen kürzen
+
+        Returns:
+            Pro Anfrage eine Liste von Erinnerungen (gleiche Reihenfolge wie queries)
+        """
+        if not queries:
+            return []
+
+        key = ("search", self.collection_name, tuple(queries), n_results, typ, max_chars)
+        return _cached(key, lambda: self._search_batch(queries, n_results, typ, max_chars))
+
+    def _search_batch(
+        self,
+        queries: list[str],
+        n_results: int,
+        typ: MemoryType | None,
+        max_chars: int | None,
+    ) -> list[list[Memory]]:
+        """Die eigentliche Chroma-Abfrage hinter search_batch (ungecacht)."""
         where_filter = {}
         if typ:
             where_filter["typ"] = typ.value
@@ -58,26 +155,33 @@ class MemoryManager:
         # semantisch über die Query.
 
         results = self.collection.query(
-            query_texts=[query],
+            query_texts=queries,
             n_results=n_results,
             where=where_filter if where_filter else None,
             include=["documents", "metadatas", "distances"],
         )
 
-        memories = []
-        if results["ids"] and results["ids"][0]:
-            for i, doc_id in enumerate(results["ids"][0]):
-                memories.append(
-                    Memory(
-                        id=doc_id,
-                        content=results["documents"][0][i],
-                        metadata=MemoryMetadata.from_chroma_metadata(
-                            results["metadatas"][0][i] if results["metadatas"] else {}
-                        ),
-                    )
-                )
-
-        return memories
+        all_ids = results["ids"] or []
+        all_docs = results["documents"] or []
+        all_metas = results["metadatas"] or []
+        from_metadata = MemoryMetadata.from_chroma_metadata
+
+        batches = []
+        for q in range(len(queries)):
+            ids = all_ids[q] if q < len(all_ids) else []
+            if not ids:
+                batches.append([])
+                continue
+            docs = all_docs[q]
+            if max_chars is not None:
+                docs = [d[:max_chars] for d in docs]
+            metas = all_metas[q] if all_metas else [{}] * len(ids)
+            batches.append([
+                Memory(id=doc_id, content=doc, metadata=from_metadata(meta))
+                for doc_id, doc, meta in zip(ids, docs, metas)
+            ])
+
+        return batches
 
     def save(self, memory: Memory) -> str:
         """
@@ -94,6 +198,7 @@ class MemoryManager:
             documents=[memory.content],
             metadatas=[memory.metadata.to_chroma_metadata()],
         )
+        clear_cache()
         return memory.id
 
     def remember(
@@ -127,7 +232,11 @@ class MemoryManager:
         return self.save(memory)
 
     def get_by_id(self, memory_id: str) -> Memory | None:
-        """Holt eine Erinnerung per ID."""
+        """Holt eine Erinnerung per ID (kurz gecacht)."""
+        return _cached(("id", self.collection_name, memory_id), lambda: self._get_by_id(memory_id))
+
+    def _get_by_id(self, memory_id: str) -> Memory | None:
+        """Holt eine Erinnerung per ID direkt aus Chroma."""
         results = self.collection.get(
             ids=[memory_id],
             include=["documents", "metadatas"],
@@ -149,6 +258,8 @@ class MemoryManager:
             return True
         except Exception:
             return False
+        finally:
+            clear_cache()
 
     def count(self) -> int:
         """Anzahl der Erinnerungen."""
@@ -10,12 +10,19 @@ Phase 4: Custom Schemas für strukturierte Memory-Typen.
 - ProceduralMemory: Gelerntes Verhalten und Muster
 """
 
+import asyncio
+import copy
+import hashlib
 import logging
+import time
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Literal
+from functools import partial
+from typing import Any, Callable, Literal
 
 from pydantic import BaseModel, Field
+from langchain_anthropic import ChatAnthropic
 from langmem import create_memory_manager
 
 from eli.config import settings
@@ -26,6 +33,33 @@ logger = logging.getLogger(__name__)
 # Separate Collection für LangMem
 LANGMEM_COLLECTION = "eli_langmem"
 
+# Cache für observe(): gleiche (normalisierte) Gespräche lösen keinen
+# neuen LLM-Aufruf aus - "hi", Grüße und Smalltalk wiederholen sich oft.
+OBSERVE_CACHE_TTL = 600  # Sekunden
+OBSERVE_CACHE_MAX_ENTRIES = 1000
+
+# Schnell aufeinanderfolgende Nachrichten eines Users werden gesammelt
+# und in einem einzigen LangMem-Aufruf analysiert
+OBSERVE_DEBOUNCE_SECONDS = 3.0
+
+# Ab dieser Embedding-Distanz gilt eine neue Erinnerung als Duplikat einer
+# bestehenden. Die Collection nutzt Chromas Standard (quadrierte L2-Distanz auf
+# normierten Embeddings = 2 * (1 - Kosinus)), 0.1 entspricht also Kosinus > 0.95.
+NEAR_DUPLICATE_DISTANCE = 0.1
+
+# Schreib-Puffer für die LangMem-Collection: Erinnerungen aus mehreren
+# observe_and_save-Aufrufen gehen gemeinsam in ein upsert()
+WRITE_BATCH_SIZE = 32
+WRITE_BATCH_DELAY = 0.2  # Sekunden
+# Fehlgeschlagene upserts werden so oft versucht (Wartezeit wächst pro Versuch)
+WRITE_MAX_ATTEMPTS = 3
+WRITE_RETRY_DELAY = 1.0  # Sekunden
+
+# count_by_type wird bei Status-Abfragen oft kurz hintereinander aufgerufen
+COUNT_CACHE_TTL = 30  # Sekunden
+
+MEMORY_TYPES = ("semantic", "episodic", "procedural")
+
 
 # ============================================================================
 # Custom Memory Schemas für LangMem
@@ -101,6 +135,50 @@ class ProceduralMemory(BaseModel):
     )
 
 
+def _from_semantic(extracted: SemanticMemory) -> tuple[str, str, dict]:
+    """Fakt: Inhalt plus Person/Konzept/Tags."""
+    return "semantic", extracted.content, {
+        "about_person": extracted.about_person,
+        "about_concept": extracted.about_concept,
+        "tags": extracted.tags,
+    }
+
+
+def _from_episodic(extracted: EpisodicMemory) -> tuple[str, str, dict]:
+    """Erlebnis: Was passiert ist, plus Beteiligte und Kontext."""
+    return "episodic", extracted.what_happened, {
+        "who_was_involved": extracted.who_was_involved,
+        "emotional_quality": extracted.emotional_quality,
+        "lesson_learned": extracted.lesson_learned,
+        "context": extracted.context,
+    }
+
+
+def _from_procedural(extracted: ProceduralMemory) -> tuple[str, str, dict]:
+    """Verhalten: "Situation: Verhalten" als Inhalt."""
+    return "procedural", f"{extracted.situation}: {extracted.behavior}", {
+        "situation": extracted.situation,
+        "behavior": extracted.behavior,
+        "reason": extracted.reason,
+        "learned_from": extracted.learned_from,
+    }
+
+
+def _from_unknown(extracted: Any) -> tuple[str, str, dict]:
+    """Fallback für unbekannte Typen."""
+    content = str(extracted.content) if hasattr(extracted, 'content') else str(extracted)
+    return "semantic", content, {}
+
+
+# Schema-Klasse -> Extraktor, einmal beim Import gebaut
+_EXTRACTORS: dict[type, Callable[[Any], tuple[str, str, dict]]] = {
+    SemanticMemory: _from_semantic,
+    EpisodicMemory: _from_episodic,
+    ProceduralMemory: _from_procedural,
+}
+_EXTRACTORS_BY_NAME = {cls.__name__: fn for cls, fn in _EXTRACTORS.items()}
+
+
 # Instruktionen für LangMem - wann welcher Typ verwendet werden soll
 MEMORY_INSTRUCTIONS = """
 Du analysierst Gespräche für Eli, eine KI mit eigenem Gedächtnis.
@@ -132,7 +210,31 @@ WICHTIG:
 """
 
 
-@dataclass
+class PromptCachingAnthropic(ChatAnthropic):
+    """
+    ChatAnthropic, das den System-Prompt als Cache-Breakpoint markiert.
+
+    LangMem schickt bei jedem Aufruf dieselben Schemas (als Tools) und
+    dieselben MEMORY_INSTRUCTIONS (im System-Prompt). Mit cache_control
+    auf dem System-Block liest Anthropic diesen Präfix aus dem Cache,
+    statt ihn jedes Mal neu zu verarbeiten.
+    """
+
+    def _get_request_payload(self, input_: Any, *, stop: list[str] | None = None, **kwargs: Any) -> dict:
+        payload = super()._get_request_payload(input_, stop=stop, **kwargs)
+        system = payload.get("system")
+        if isinstance(system, str) and system:
+            payload["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        elif isinstance(system, list) and system and isinstance(system[-1], dict):
+            system[-1].setdefault("cache_control", {"type": "ephemeral"})
+        return payload
+
+
+# Symbol je Memory-Typ für Anzeige und Logs
+_TYPE_EMOJI = {"semantic": "📚", "episodic": "📖", "procedural": "🎯"}
+
+
+@dataclass(slots=True)
 class SuggestedMemory:
     """Ein Vorschlag von LangMem mit strukturiertem Typ."""
 
@@ -145,7 +247,7 @@ class SuggestedMemory:
     structured_data: dict = field(default_factory=dict)
 
     def __str__(self) -> str:
-        type_emoji = {"semantic": "📚", "episodic": "📖", "procedural": "🎯"}.get(self.memory_type, "💭")
+        type_emoji = _TYPE_EMOJI.get(self.memory_type, "💭")
         if self.action == "create":
             return f"[NEU {type_emoji}] {self.content}"
         elif self.action == "update":
@@ -168,13 +270,29 @@ class MemoryObserver:
         self.model = model
         self._manager = None
         self._collection = None
+        # Gesprächs-Schlüssel -> (Ablaufzeitpunkt, Vorschläge), älteste zuerst
+        self._obs_cache: OrderedDict[str, tuple[float, list[SuggestedMemory]]] = OrderedDict()
+        # (Ablaufzeitpunkt, Zählung) für count_by_type
+        self._type_counts: tuple[float, dict[str, int]] | None = None
+        # Debounce pro User: gesammelte Nachrichten, gemeinsames Ergebnis, Timer
+        self._pending: defaultdict[str, list[dict[str, str]]] = defaultdict(list)
+        self._pending_results: dict[str, asyncio.Future] = {}
+        self._flush_tasks: dict[str, asyncio.Task] = {}
+        self._running_flushes: set[asyncio.Task] = set()
+        # Gesetzt von aclose() - wartende Debounce-Runden laufen dann sofort
+        self._closing = asyncio.Event()
+        # Hintergrund-Schreiber: (id, dokument, metadaten, future) -> upsert in Batches
+        self._write_queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        # Queue und Schreiber gehören zu dem Event Loop, der sie angelegt hat
+        self._write_loop: asyncio.AbstractEventLoop | None = None
 
     @property
     def manager(self):
         """Lazy-Loading des Memory Managers mit Custom Schemas."""
         if self._manager is None:
             self._manager = create_memory_manager(
-                self.model,
+                self._create_model(),
                 schemas=[SemanticMemory, EpisodicMemory, ProceduralMemory],
                 instructions=MEMORY_INSTRUCTIONS,
                 enable_inserts=True,
@@ -183,6 +301,14 @@ class MemoryObserver:
             )
         return self._manager
 
+    def _create_model(self) -> Any:
+        """Anthropic-Modelle mit Prompt Caching, andere Provider unverändert."""
+        provider, _, model_name = self.model.partition(":")
+        if provider != "anthropic" or not model_name:
+            return self.model
+        kwargs = {"api_key": settings.anthropic_api_key} if settings.anthropic_api_key else {}
+        return PromptCachingAnthropic(model=model_name, **kwargs)
+
     @property
     def collection(self):
         """Lazy-Loading der LangMem Collection."""
@@ -202,42 +328,38 @@ class MemoryObserver:
         Returns:
             (memory_type, content_string, structured_data_dict)
         """
-        # Bestimme den Typ basierend auf der Klasse
-        class_name = type(extracted).__name__
-
-        if class_name == "SemanticMemory" or isinstance(extracted, SemanticMemory):
-            memory_type = "semantic"
-            content = extracted.content
-            structured = {
-                "about_person": extracted.about_person,
-                "about_concept": extracted.about_concept,
-                "tags": extracted.tags,
-            }
-        elif class_name == "EpisodicMemory" or isinstance(extracted, EpisodicMemory):
-            memory_type = "episodic"
-            content = extracted.what_happened
-            structured = {
-                "who_was_involved": extracted.who_was_involved,
-                "emotional_quality": extracted.emotional_quality,
-                "lesson_learned": extracted.lesson_learned,
-                "context": extracted.context,
-            }
-        elif class_name == "ProceduralMemory" or isinstance(extracted, ProceduralMemory):
-            memory_type = "procedural"
-            content = f"{extracted.situation}: {extracted.behavior}"
-            structured = {
-                "situation": extracted.situation,
-                "behavior": extracted.behavior,
-                "reason": extracted.reason,
-                "learned_from": extracted.learned_from,
-            }
-        else:
-            # Fallback für unbekannte Typen
-            memory_type = "semantic"
-            content = str(extracted.content) if hasattr(extracted, 'content') else str(extracted)
-            structured = {}
-
-        return memory_type, content, structured
+        # Bestimme den Typ basierend auf der Klasse (notfalls über den Klassennamen)
+        cls = type(extracted)
+        extract = _EXTRACTORS.get(cls) or _EXTRACTORS_BY_NAME.get(cls.__name__, _from_unknown)
+        return extract(extracted)
+
+    @staticmethod
+    def _conversation_key(messages: list[dict[str, str]]) -> str:
+        """Schlüssel für den observe-Cache: Hash des ganzen normalisierten Gesprächs."""
+        text = "\n".join(
+            f"{m.get('role', '')}:{' '.join(str(m.get('content', '')).lower().split())}"
+            for m in messages
+        )
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cached_suggestions(self, key: str) -> list[SuggestedMemory] | None:
+        """Liefert gecachte Vorschläge (als Kopie) oder None."""
+        hit = self._obs_cache.get(key)
+        if hit is None:
+            return None
+        expires, suggestions = hit
+        if time.monotonic() >= expires:
+            del self._obs_cache[key]
+            return None
+        self._obs_cache.move_to_end(key)
+        return copy.deepcopy(suggestions)
+
+    def _cache_suggestions(self, key: str, suggestions: list[SuggestedMemory]) -> None:
+        """Merkt sich die Vorschläge zu einem Gespräch (LRU, begrenzte Größe)."""
+        self._obs_cache[key] = (time.monotonic() + OBSERVE_CACHE_TTL, copy.deepcopy(suggestions))
+        self._obs_cache.move_to_end(key)
+        while len(self._obs_cache) > OBSERVE_CACHE_MAX_ENTRIES:
+            self._obs_cache.popitem(last=False)
 
     async def observe(
         self,
@@ -247,7 +369,15 @@ class MemoryObserver:
     ) -> list[SuggestedMemory]:
         """
         Analysiert ein Gespräch und gibt strukturierte Vorschläge zurück.
+
+        Wiederholte Gespräche (gleicher Text nach Normalisierung) werden
+        für OBSERVE_CACHE_TTL Sekunden aus dem Cache beantwortet.
         """
+        key = self._conversation_key(messages)
+        cached = self._cached_suggestions(key)
+        if cached is not None:
+            return cached
+
         try:
             result = await self.manager.ainvoke({
                 "messages": messages,
@@ -268,12 +398,42 @@ class MemoryObserver:
                     )
                 )
 
+            self._cache_suggestions(key, suggestions)
             return suggestions
 
         except Exception as e:
             logger.error(f"MemoryObserver.observe Fehler: {e}")
             return []
 
+    @staticmethod
+    def _build_metadata(
+        suggestion: SuggestedMemory,
+        user_id: str | None,
+        user_name: str | None,
+        erstellt: str,
+    ) -> dict[str, str]:
+        """Baut die Chroma-Metadaten für einen Vorschlag."""
+        # Basis-Metadaten
+        metadata = {
+            "quelle": "langmem",
+            "memory_type": suggestion.memory_type,
+            "erstellt": erstellt,
+            "user_id": user_id or "unknown",
+            "user_name": user_name or "unknown",
+        }
+
+        # Strukturierte Daten als Metadaten hinzufügen
+        # (Chroma unterstützt nur str, int, float, bool als Metadaten)
+        for key, value in suggestion.structured_data.items():
+            if value is not None:
+                if isinstance(value, list):
+                    # Listen als komma-separierte Strings
+                    metadata[key] = ", ".join(str(v) for v in value) if value else ""
+                else:
+                    metadata[key] = str(value)
+
+        return metadata
+
     async def observe_and_save(
         self,
         messages: list[dict[str, str]],
@@ -291,47 +451,275 @@ class MemoryObserver:
         if not suggestions or not self.collection:
             return suggestions
 
-        # In LangMem-Collection speichern
+        # In LangMem-Collection speichern - alle neuen Erinnerungen gesammelt
+        ids, documents, metadatas, created = [], [], [], []
+        # Ein Zeitstempel für die ganze Beobachtung
+        erstellt = datetime.now().isoformat()
         for suggestion in suggestions:
             if suggestion.action == "create":
+                # ID aus Typ-Präfix und Inhalts-Hash: derselbe Fakt bekommt immer
+                # dieselbe ID, erneutes Beobachten legt also kein Duplikat an.
+                # Der Zeitpunkt steht nur in den Metadaten ("erstellt").
+                type_prefix = suggestion.memory_type[:3]  # sem, epi, pro
+                sig = hashlib.blake2b(suggestion.content.encode("utf-8"), digest_size=16).hexdigest()
+                memory_id = f"langmem-{type_prefix}-{sig}"
+                if memory_id in ids:
+                    # Gleicher Inhalt doppelt vorgeschlagen - Chroma lehnt doppelte IDs im Batch ab
+                    continue
+
+                ids.append(memory_id)
+                documents.append(suggestion.content)
+                metadatas.append(self._build_metadata(suggestion, user_id, user_name, erstellt))
+                created.append(suggestion)
+
+        if not ids:
+            return suggestions
+
+        # Fast gleiche Erinnerungen gibt es schon - dort nur die Metadaten auffrischen
+        duplicates = await self._find_near_duplicates(documents, metadatas)
+        if duplicates:
+            updates = {}
+            for i, (existing_id, existing_meta) in duplicates.items():
+                updates[existing_id] = {
+                    **existing_meta,
+                    **metadatas[i],
+                    "erstellt": existing_meta.get("erstellt", erstellt),
+                    "aktualisiert": erstellt,
+                }
+                created[i].memory_id = existing_id
+                logger.info(f"LangMem schon bekannt ({existing_id}): {created[i].content[:50]}...")
+            try:
+                await asyncio.to_thread(
+                    self.collection.update, ids=list(updates), metadatas=list(updates.values())
+                )
+            except Exception as e:
+                logger.error(f"LangMem aktualisieren fehlgeschlagen: {e}")
+
+        new_rows = [i for i in range(len(ids)) if i not in duplicates]
+        if not new_rows:
+            return suggestions
+
+        # Schreiben übernimmt der Hintergrund-Schreiber - die IDs stehen schon fest
+        written = self._enqueue_writes(
+            [ids[i] for i in new_rows],
+            [documents[i] for i in new_rows],
+            [metadatas[i] for i in new_rows],
+        )
+
+        for i, future in zip(new_rows, written):
+            suggestion = created[i]
+            suggestion.memory_id = ids[i]
+            future.add_done_callback(partial(self._on_write_done, suggestion))
+            type_emoji = _TYPE_EMOJI.get(suggestion.memory_type, "💭")
+            logger.info(f"LangMem {type_emoji} eingereiht: {suggestion.content[:50]}...")
+
+        return suggestions
+
+    async def _find_near_duplicates(
+        self,
+        documents: list[str],
+        metadatas: list[dict],
+    ) -> dict[int, tuple[str, dict]]:
+        """
+        Sucht zu jedem neuen Dokument die nächste bestehende Erinnerung.
+
+        Returns:
+            Index in documents -> (ID, Metadaten) einer fast gleichen Erinnerung
+            desselben Typs (Distanz unter NEAR_DUPLICATE_DISTANCE)
+        """
+        # Pro Typ eine Abfrage mit Filter - sonst verdeckt ein näherer Treffer
+        # eines anderen Typs das eigentliche Duplikat
+        by_type: dict[str, list[int]] = {}
+        for i, meta in enumerate(metadatas):
+            by_type.setdefault(meta["memory_type"], []).append(i)
+
+        def query_all() -> dict[str, dict]:
+            return {
+                memory_type: self.collection.query(
+                    query_texts=[documents[i] for i in indices],
+                    n_results=1,
+                    where={"memory_type": memory_type},
+                    include=["metadatas", "distances"],
+                )
+                for memory_type, indices in by_type.items()
+            }
+
+        try:
+            hits_by_type = await asyncio.to_thread(query_all)
+        except Exception as e:
+            logger.warning(f"LangMem Duplikat-Prüfung fehlgeschlagen: {e}")
+            return {}
+
+        duplicates = {}
+        for memory_type, hits in hits_by_type.items():
+            rows = zip(
+                by_type[memory_type],
+                hits.get("ids") or [],
+                hits.get("metadatas") or [],
+                hits.get("distances") or [],
+            )
+            for i, hit_ids, hit_metas, hit_distances in rows:
+                if hit_ids and hit_distances[0] < NEAR_DUPLICATE_DISTANCE:
+                    duplicates[i] = (hit_ids[0], hit_metas[0] or {})
+        return duplicates
+
+    def _enqueue_writes(
+        self, ids: list[str], documents: list[str], metadatas: list[dict]
+    ) -> list[asyncio.Future]:
+        """
+        Reiht Erinnerungen für den Hintergrund-Schreiber ein (startet ihn bei Bedarf).
+
+        Returns:
+            Ein Future pro Erinnerung - erfüllt sobald sie geschrieben ist,
+            mit der Exception wenn alle Versuche fehlgeschlagen sind
+        """
+        loop = asyncio.get_running_loop()
+        if self._write_queue is None or self._write_loop is not loop:
+            # Erster Aufruf oder neuer Loop (z.B. mehrere asyncio.run):
+            # Queue und Schreiber des alten Loops sind unbrauchbar
+            if self._write_queue is not None and self._write_queue.qsize():
+                logger.warning(
+                    f"LangMem: {self._write_queue.qsize()} Erinnerungen eines beendeten Loops verworfen"
+                )
+            self._write_queue = asyncio.Queue()
+            self._writer_task = None
+            self._write_loop = loop
+        futures = []
+        for row in zip(ids, documents, metadatas):
+            future = loop.create_future()
+            self._write_queue.put_nowait((*row, future))
+            futures.append(future)
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer())
+        return futures
+
+    @staticmethod
+    def _on_write_done(suggestion: SuggestedMemory, future: asyncio.Future) -> None:
+        """Nimmt die ID einer nicht geschriebenen Erinnerung wieder zurück."""
+        error = future.exception()
+        if error is not None:
+            suggestion.memory_id = None
+            logger.error(f"LangMem nicht gespeichert: {suggestion.content[:50]}... ({error})")
+
+    async def _writer(self) -> None:
+        """
+        Schreibt eingereihte Erinnerungen gebündelt in die Collection.
+
+        Wartet nach dem ersten Eintrag bis zu WRITE_BATCH_DELAY Sekunden auf
+        weitere (höchstens WRITE_BATCH_SIZE) und schreibt sie dann in einem upsert().
+        """
+        queue = self._write_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + WRITE_BATCH_DELAY
+            while len(batch) < WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Gleiche ID aus mehreren Aufrufen: der neueste Stand gewinnt
+            rows = {memory_id: (doc, meta) for memory_id, doc, meta, _ in batch}
+            error = None
+            for attempt in range(1, WRITE_MAX_ATTEMPTS + 1):
                 try:
-                    # ID mit Typ-Präfix für bessere Identifikation
-                    type_prefix = suggestion.memory_type[:3]  # sem, epi, pro
-                    memory_id = f"langmem-{type_prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{hash(suggestion.content) % 10000}"
-
-                    # Basis-Metadaten
-                    metadata = {
-                        "quelle": "langmem",
-                        "memory_type": suggestion.memory_type,
-                        "erstellt": datetime.now().isoformat(),
-                        "user_id": user_id or "unknown",
-                        "user_name": user_name or "unknown",
-                    }
-
-                    # Strukturierte Daten als Metadaten hinzufügen
-                    # (Chroma unterstützt nur str, int, float, bool als Metadaten)
-                    for key, value in suggestion.structured_data.items():
-                        if value is not None:
-                            if isinstance(value, list):
-                                # Listen als komma-separierte Strings
-                                metadata[key] = ", ".join(str(v) for v in value) if value else ""
-                            else:
-                                metadata[key] = str(value)
-
-                    self.collection.add(
-                        ids=[memory_id],
-                        documents=[suggestion.content],
-                        metadatas=[metadata],
+                    await asyncio.to_thread(
+                        self.collection.upsert,
+                        ids=list(rows),
+                        documents=[doc for doc, _ in rows.values()],
+                        metadatas=[meta for _, meta in rows.values()],
                     )
+                    error = None
+                    break
+                except Exception as e:
+                    error = e
+                    logger.warning(
+                        f"LangMem speichern fehlgeschlagen (Versuch {attempt}/{WRITE_MAX_ATTEMPTS}): {e}"
+                    )
+                    if attempt < WRITE_MAX_ATTEMPTS:
+                        await asyncio.sleep(WRITE_RETRY_DELAY * attempt)
+
+            if error is None:
+                self._type_counts = None
+                logger.info(f"LangMem: {len(rows)} Erinnerungen gespeichert")
+            else:
+                logger.error(f"LangMem: {len(rows)} Erinnerungen verworfen: {error}")
+
+            for *_, future in batch:
+                if not future.done():
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+                queue.task_done()
 
-                    suggestion.memory_id = memory_id
-                    type_emoji = {"semantic": "📚", "episodic": "📖", "procedural": "🎯"}.get(suggestion.memory_type, "💭")
-                    logger.info(f"LangMem {type_emoji} gespeichert: {suggestion.content[:50]}...")
+    async def flush_writes(self) -> None:
+        """
+        Wartet, bis alle eingereihten Erinnerungen geschrieben (oder endgültig
+        gescheitert) sind. Gescheiterte Vorschläge haben danach keine memory_id mehr.
+        """
+        if self._write_queue is not None and self._write_loop is asyncio.get_running_loop():
+            await self._write_queue.join()
 
-                except Exception as e:
-                    logger.error(f"LangMem speichern fehlgeschlagen: {e}")
+    def observe_and_save_later(
+        self,
+        messages: list[dict[str, str]],
+        user_id: str | None = None,
+        user_name: str | None = None,
+    ) -> asyncio.Future:
+        """
+        Wie observe_and_save, aber mit Debounce pro User.
 
-        return suggestions
+        Nachrichten, die innerhalb von OBSERVE_DEBOUNCE_SECONDS eintreffen,
+        werden zu einem Gespräch zusammengefasst und gemeinsam analysiert.
+        Das zurückgegebene Future liefert die Vorschläge dieses Durchlaufs.
+        """
+        key = user_id or "unknown"
+        self._pending[key].extend(messages)
+        if key not in self._pending_results:
+            self._pending_results[key] = asyncio.get_running_loop().create_future()
+
+        # Timer neu starten - erst wenn der User kurz still ist, wird analysiert
+        timer = self._flush_tasks.pop(key, None)
+        if timer:
+            timer.cancel()
+        self._flush_tasks[key] = asyncio.create_task(self._flush_later(key, user_id, user_name))
+        return self._pending_results[key]
+
+    async def _flush_later(self, key: str, user_id: str | None, user_name: str | None) -> None:
+        """Wartet das Debounce-Fenster ab und analysiert dann alles Gesammelte."""
+        try:
+            # Vorzeitig weiter, wenn aclose() beim Beenden alles abschließen will
+            await asyncio.wait_for(self._closing.wait(), OBSERVE_DEBOUNCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+        # Ab hier nicht mehr abbrechbar: neue Nachrichten starten eine eigene Runde
+        task = self._flush_tasks.pop(key)
+        self._running_flushes.add(task)
+        task.add_done_callback(self._running_flushes.discard)
+        messages = self._pending.pop(key, [])
+        result = self._pending_results.pop(key)
+
+        try:
+            result.set_result(await self.observe_and_save(messages, user_id, user_name))
+        except Exception as e:
+            result.set_exception(e)
+
+    async def aclose(self) -> None:
+        """
+        Schließt beim Beenden alles Offene ab: wartende Debounce-Runden werden
+        sofort analysiert, danach alle eingereihten Erinnerungen geschrieben.
+        """
+        self._closing.set()
+        pending = [*self._flush_tasks.values(), *self._running_flushes]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.flush_writes()
 
     def count_langmem(self) -> int:
         """Zählt LangMem-Erinnerungen."""
@@ -368,17 +756,21 @@ class MemoryObserver:
                 where=where_filter,
             )
 
-            memories = []
-            if results and results.get("documents"):
-                for i, doc in enumerate(results["documents"][0]):
-                    metadata = results["metadatas"][0][i] if results.get("metadatas") else {}
-                    memories.append({
-                        "id": results["ids"][0][i] if results.get("ids") else None,
-                        "content": doc,
-                        "memory_type": metadata.get("memory_type", "unknown"),
-                        "metadata": metadata,
-                    })
-            return memories
+            if not results or not results.get("documents"):
+                return []
+
+            docs = results["documents"][0]
+            metas = results["metadatas"][0] if results.get("metadatas") else [{}] * len(docs)
+            ids = results["ids"][0] if results.get("ids") else [None] * len(docs)
+            return [
+                {
+                    "id": memory_id,
+                    "content": doc,
+                    "memory_type": metadata.get("memory_type", "unknown"),
+                    "metadata": metadata,
+                }
+                for memory_id, doc, metadata in zip(ids, docs, metas)
+            ]
 
         except Exception as e:
             logger.error(f"LangMem Suche fehlgeschlagen: {e}")
@@ -388,11 +780,13 @@ class MemoryObserver:
         self,
         memory_type: Literal["semantic", "episodic", "procedural"],
         limit: int = 10,
+        max_chars: int | None = None,
     ) -> list[dict]:
         """
         Holt alle Memories eines bestimmten Typs.
 
         Nützlich um z.B. alle gelernten Verhaltensweisen (procedural) zu sehen.
+        Mit max_chars wird der Inhalt direkt hier gekürzt (für Übersichten).
         """
         if not self.collection:
             return []
@@ -409,7 +803,7 @@ class MemoryObserver:
                     metadata = results["metadatas"][i] if results.get("metadatas") else {}
                     memories.append({
                         "id": results["ids"][i] if results.get("ids") else None,
-                        "content": doc,
+                        "content": doc if max_chars is None else doc[:max_chars],
                         "memory_type": memory_type,
                         "metadata": metadata,
                     })
@@ -420,25 +814,24 @@ class MemoryObserver:
             return []
 
     def count_by_type(self) -> dict[str, int]:
-        """Zählt Memories nach Typ."""
+        """Zählt Memories nach Typ (für COUNT_CACHE_TTL Sekunden gecacht)."""
         counts = {"semantic": 0, "episodic": 0, "procedural": 0, "other": 0}
 
         if not self.collection:
             return counts
 
+        if self._type_counts and time.monotonic() < self._type_counts[0]:
+            return dict(self._type_counts[1])
+
         try:
-            # Alle Metadaten holen (ohne Embeddings für Performance)
-            results = self.collection.get(include=["metadatas"])
-
-            if results and results.get("metadatas"):
-                for metadata in results["metadatas"]:
-                    mem_type = metadata.get("memory_type", "other")
-                    if mem_type in counts:
-                        counts[mem_type] += 1
-                    else:
-                        counts["other"] += 1
+            # Pro Typ nur die IDs holen - keine Dokumente, Metadaten oder Embeddings
+            for memory_type in MEMORY_TYPES:
+                results = self.collection.get(where={"memory_type": memory_type}, include=[])
+                counts[memory_type] = len(results["ids"]) if results else 0
+            counts["other"] = max(self.collection.count() - sum(counts.values()), 0)
 
-            return counts
+            self._type_counts = (time.monotonic() + COUNT_CACHE_TTL, counts)
+            return dict(counts)
 
         except Exception as e:
             logger.error(f"LangMem count_by_type fehlgeschlagen: {e}")
@@ -459,5 +852,9 @@ async def remember_conversation(
     user_id: str | None = None,
     user_name: str | None = None,
 ) -> list[SuggestedMemory]:
-    """Phase 3: Analysieren UND automatisch speichern."""
-    return await observer.observe_and_save(messages, user_id, user_name)
+    """Phase 3: Analysieren UND automatisch speichern (wartet bis geschrieben ist)."""
+    suggestions = await observer.observe_and_save(messages, user_id, user_name)
+    # Sonst kommen die IDs zurück, bevor etwas geschrieben ist - und
+    # gescheiterte Vorschläge verlieren ihre memory_id erst danach
+    await observer.flush_writes()
+    return suggestions
@@ -19,7 +19,7 @@ Drei Arten von Erinnerungen:
 
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Iterable
 
 from pydantic import BaseModel, Field
 
@@ -55,16 +55,22 @@ class MemoryMetadata(BaseModel):
 
     def to_chroma_metadata(self) -> dict[str, Any]:
         """Konvertiert zu Chroma-kompatiblem Dict."""
+        join = ",".join  # Listen als komma-getrennte Strings
         return {
             "typ": self.typ.value,
-            "betrifft": ",".join(self.betrifft),
+            "betrifft": join(self.betrifft),
             "quelle": self.quelle,
             "sensibel": self.sensibel,
-            "sichtbar_fuer": ",".join(self.sichtbar_fuer),
+            "sichtbar_fuer": join(self.sichtbar_fuer),
             "erstellt": self.erstellt.isoformat(),
-            "tags": ",".join(self.tags),
+            "tags": join(self.tags),
         }
 
+    @staticmethod
+    def to_chroma_metadata_batch(items: Iterable["MemoryMetadata"]) -> list[dict[str, Any]]:
+        """Wie to_chroma_metadata, für viele Einträge auf einmal (z.B. beim Import)."""
+        return [m.to_chroma_metadata() for m in items]
+
     @classmethod
     def from_chroma_metadata(cls, data: dict[str, Any]) -> "MemoryMetadata":
         """Erstellt MemoryMetadata aus Chroma-Dict.
@@ -97,6 +103,12 @@ class MemoryMetadata(BaseModel):
             tags=data.get("tags", "").split(",") if data.get("tags") else [],
         )
 
+    @classmethod
+    def from_chroma_metadata_batch(cls, items: Iterable[dict[str, Any]]) -> list["MemoryMetadata"]:
+        """Wie from_chroma_metadata, für viele Einträge auf einmal."""
+        convert = cls.from_chroma_metadata
+        return [convert(data) for data in items]
+
 
 class Memory(BaseModel):
     """Eine einzelne Erinnerung."""
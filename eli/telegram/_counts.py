@@ -0,0 +1,41 @@
+"""
+Eli's Geist - Erinnerungs-Zähler
+================================
+
+Kurz gecachte Anzahl der Erinnerungen für /status und das Erwachen.
+Ein paar Sekunden alte Zahlen sind dort völlig ausreichend.
+"""
+
+import asyncio
+import time
+
+# Wie lange die Zahlen gültig bleiben (Sekunden)
+COUNTS_TTL = 5.0
+
+# (Zeitpunkt, manuelle Erinnerungen, LangMem-Erinnerungen)
+_last: tuple[float, int, int] | None = None
+
+
+def _count_all() -> tuple[int, int]:
+    """Zählt beide Collections (blockierend)."""
+    from eli.memory.manager import memory
+    from eli.memory.observer import observer
+
+    return memory.count(), observer.count_langmem()
+
+
+async def get_counts() -> tuple[int, int]:
+    """
+    Anzahl manueller und automatischer (LangMem) Erinnerungen.
+
+    Returns:
+        (memory_count, langmem_count), höchstens COUNTS_TTL Sekunden alt
+    """
+    global _last
+    now = time.monotonic()
+    if _last is not None and now - _last[0] < COUNTS_TTL:
+        return _last[1], _last[2]
+
+    memory_count, langmem_count = await asyncio.to_thread(_count_all)
+    _last = (now, memory_count, langmem_count)
+    return memory_count, langmem_count
@@ -10,42 +10,82 @@ Unterstützt zwei LLM-Modi:
 - BlockRun mit x402 Payments (zahlt selbst mit USDC)
 """
 
+import asyncio
 import logging
+import re
 from typing import Any
 
 from aiogram import Bot, Dispatcher, F
 from aiogram.filters import Command
-from aiogram.types import Message
+from aiogram.types import Message, User
+from aiogram.utils.chat_action import ChatActionSender
 from aiogram.enums import ChatType, ParseMode
 
 from eli.agent.graph import chat, OutOfCreditsError, InsufficientFundsError
 from eli.config import settings
-from eli.telegram.voice import download_and_transcribe
-from eli.telegram.history import get_history, add_exchange
+from eli.memory.observer import observer
+from eli.telegram.voice import download_and_transcribe, close_client as close_voice_client
+from eli.telegram._counts import get_counts
+from eli.telegram.history import get_history_async, add_exchange_async
+from eli.telegram.sender import answer
 
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _configured_users() -> frozenset[int]:
+    """Anton plus weitere erlaubte User aus Config."""
+    users = set(settings.allowed_telegram_ids)
+    if settings.anton_telegram_id:
+        users.add(settings.anton_telegram_id)
+    return frozenset(users)
+
+
 # Whitelist von erlaubten User IDs (geschlossener Kreis)
-ALLOWED_USERS: set[int] = set()
-if settings.anton_telegram_id:
-    ALLOWED_USERS.add(settings.anton_telegram_id)
-# Weitere erlaubte User aus Config
-ALLOWED_USERS.update(settings.allowed_telegram_ids)
+# Unveränderlich - add_allowed_user ersetzt sie durch eine neue Menge
+ALLOWED_USERS: frozenset[int] = _configured_users()
+# Keine Whitelist konfiguriert -> alle erlauben (Entwicklung)
+_ALLOW_ALL = not ALLOWED_USERS
 
 # Erlaubte Gruppen - NUR diese Gruppen können mit Eli interagieren
 # Gruppen müssen explizit freigeschaltet werden (Sicherheit)
-ALLOWED_GROUPS: set[int] = set()
-ALLOWED_GROUPS.update(settings.allowed_telegram_groups)
+ALLOWED_GROUPS: frozenset[int] = frozenset(settings.allowed_telegram_groups)
 
 # Bot-Username wird beim Start gesetzt
 BOT_USERNAME: str = ""
 
+# Ergebnis von bot.get_me() - ändert sich für ein Token nie
+_BOT_INFO: User | None = None
+
+
+# Alle Arten, Eli in einer Gruppe mit Namen anzusprechen:
+# "eli" am Anfang, "eli" als eigenes Wort, "eli," / "eli:" / "eli?"
+# (@-Erwähnungen erkennt Telegram selbst, siehe message.entities)
+_TRIGGER_RE = re.compile(r"^eli|(?<!\S)eli(?!\S)|eli[,:?]", re.IGNORECASE)
+
+
+def _build_clean_re(bot_username: str) -> re.Pattern:
+    """
+    Ein Regex, der die @-Erwähnung und ein einleitendes "Eli," / "Eli:"
+    (auch nach der Erwähnung) in einem Durchlauf entfernt.
+    """
+    mention = "@" + re.escape(bot_username)
+    return re.compile(rf"^\s*(?:{mention}\s*)?eli[,:\s]+|{mention}", re.IGNORECASE)
+
+
+# Werden in run_bot neu gesetzt, sobald BOT_USERNAME bekannt ist
+_CLEAN_RE = _build_clean_re("")
+_BOT_MENTION = ""  # "@username" in Kleinbuchstaben
+
 # Chats die bereits die Credit-Nachricht erhalten haben
 # Wird pro Bot-Session zurückgesetzt (bei Neustart)
 NOTIFIED_CHATS: set[int] = set()
 
+# Laufende Hintergrund-Tasks (History speichern) - Referenz halten,
+# damit sie nicht vorzeitig vom Garbage Collector eingesammelt werden
+_bg_tasks: set[asyncio.Task] = set()
+
 # Fallback-Nachricht wenn Credits/USDC aufgebraucht sind
 OUT_OF_CREDITS_MESSAGE = """Kurze Nachricht aus dem Maschinenraum:
 
@@ -74,18 +114,37 @@ async def send_markdown(message: Message, text: str) -> None:
     Falls Telegram das Parsing ablehnt, wird unformatiert gesendet.
     """
     try:
-        await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+        await answer(message, text, parse_mode=ParseMode.MARKDOWN)
     except Exception:
         # Markdown-Parsing fehlgeschlagen — unformatiert senden
-        await message.answer(text)
+        await answer(message, text)
+
+
+def _log_bg_result(task: asyncio.Task) -> None:
+    """Entfernt einen fertigen Hintergrund-Task und loggt Fehler."""
+    _bg_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error("Hintergrund-Task fehlgeschlagen: %s", task.exception())
+
+
+def save_exchange_in_background(user_id: str, user_message: str, response: str) -> None:
+    """Speichert einen Austausch in der History, ohne die Antwort aufzuhalten."""
+    task = asyncio.create_task(add_exchange_async(user_id, user_message, response))
+    _bg_tasks.add(task)
+    task.add_done_callback(_log_bg_result)
+
+
+async def get_bot_info(bot: Bot) -> User:
+    """bot.get_me(), aber nur einmal pro Prozess per API abgefragt."""
+    global _BOT_INFO
+    if _BOT_INFO is None:
+        _BOT_INFO = await bot.get_me()
+    return _BOT_INFO
 
 
 def is_allowed(user_id: int) -> bool:
     """Prüft ob ein User zum Kreis gehört."""
-    # Wenn keine Whitelist konfiguriert, alle erlauben (Entwicklung)
-    if not ALLOWED_USERS:
-        return True
-    return user_id in ALLOWED_USERS
+    return _ALLOW_ALL or user_id in ALLOWED_USERS
 
 
 def is_group_allowed(chat_id: int) -> bool:
@@ -95,21 +154,22 @@ def is_group_allowed(chat_id: int) -> bool:
     SICHERHEIT: Gruppen müssen explizit in ALLOWED_TELEGRAM_GROUPS sein.
     Wenn keine Gruppen konfiguriert sind, sind KEINE Gruppen erlaubt.
     """
-    if not ALLOWED_GROUPS:
-        # Keine Gruppen freigeschaltet = alle Gruppen blockiert
-        return False
+    # Keine Gruppen freigeschaltet = leere Menge = alle Gruppen blockiert
     return chat_id in ALLOWED_GROUPS
 
 
 def add_allowed_user(user_id: int) -> None:
     """Fügt einen User zur Whitelist hinzu."""
-    ALLOWED_USERS.add(user_id)
+    global ALLOWED_USERS, _ALLOW_ALL
+    ALLOWED_USERS = ALLOWED_USERS | {user_id}
+    _ALLOW_ALL = False
 
 
 def add_allowed_group(chat_id: int) -> None:
     """Fügt eine Gruppe zur Whitelist hinzu."""
-    ALLOWED_GROUPS.add(chat_id)
-    logger.info(f"Gruppe {chat_id} zur Whitelist hinzugefügt")
+    global ALLOWED_GROUPS
+    ALLOWED_GROUPS = ALLOWED_GROUPS | {chat_id}
+    logger.info("Gruppe %s zur Whitelist hinzugefügt", chat_id)
 
 
 def is_group_chat(message: Message) -> bool:
@@ -127,23 +187,23 @@ def should_respond_in_group(message: Message, bot_username: str) -> bool:
     - Mit "Eli" angesprochen wird
     """
     text = message.text or ""
-    text_lower = text.lower()
-    
-    # Direkte Erwähnung mit @
-    if bot_username and f"@{bot_username}".lower() in text_lower:
-        return True
-    
-    # Mit Namen angesprochen (verschiedene Varianten)
-    if text_lower.startswith("eli"):
-        return True
-    if " eli " in f" {text_lower} ":  # "eli" als Wort
-        return True
-    if "eli," in text_lower or "eli:" in text_lower or "eli?" in text_lower:
+
+    # Direkte Erwähnung mit @ - von Telegram bereits als Entity markiert
+    for entity in message.entities or ():
+        if entity.type == "mention" and entity.extract_from(text).lower() == _BOT_MENTION:
+            return True
+
+    # Mit Namen angesprochen
+    if _TRIGGER_RE.search(text):
         return True
     
-    # Reply auf Eli's Nachricht
+    # Reply auf Eli's Nachricht - per ID, sobald bekannt (kein String-Vergleich)
     if message.reply_to_message and message.reply_to_message.from_user:
-        if message.reply_to_message.from_user.username == bot_username:
+        replied_to = message.reply_to_message.from_user
+        if _BOT_INFO is not None:
+            if replied_to.id == _BOT_INFO.id:
+                return True
+        elif replied_to.username == bot_username:
             return True
     
     return False
@@ -160,22 +220,30 @@ async def handle_funding_issue(message: Message, is_usdc: bool = False) -> None:
     
     if chat_id in NOTIFIED_CHATS:
         # Bereits benachrichtigt - schweigen
-        logger.debug(f"Chat {chat_id} bereits über Funding-Problem informiert - schweige")
+        logger.debug("Chat %s bereits über Funding-Problem informiert - schweige", chat_id)
         return
     
     # Erste Benachrichtigung für diesen Chat
     problem_type = "USDC-Balance" if is_usdc else "API-Credits"
-    logger.warning(f"{problem_type} erschöpft - informiere Chat {chat_id} (einmalig)")
+    logger.warning("%s erschöpft - informiere Chat %s (einmalig)", problem_type, chat_id)
     NOTIFIED_CHATS.add(chat_id)
     
     msg = INSUFFICIENT_FUNDS_MESSAGE if is_usdc else OUT_OF_CREDITS_MESSAGE
-    await message.answer(msg)
+    await answer(message, msg)
+
+
+# Bot und Dispatcher aus create_bot - nur einmal gebaut, damit die Handler
+# bei erneutem Aufruf (Reload, Tests) nicht mehrfach registriert werden
+_BOT_AND_DP: tuple[Bot, Dispatcher] | None = None
 
 
 def create_bot() -> tuple[Bot, Dispatcher]:
-    """Erstellt Bot und Dispatcher."""
-    global BOT_USERNAME
-    
+    """Erstellt Bot und Dispatcher (beim ersten Aufruf, danach dieselben)."""
+    global _BOT_AND_DP
+
+    if _BOT_AND_DP is not None:
+        return _BOT_AND_DP
+
     bot = Bot(token=settings.telegram_bot_token)
     dp = Dispatcher()
 
@@ -185,14 +253,16 @@ def create_bot() -> tuple[Bot, Dispatcher]:
         if is_group_chat(message):
             # Gruppe muss freigeschaltet sein
             if not is_group_allowed(message.chat.id):
-                logger.info(f"Nicht freigeschaltete Gruppe: {message.chat.title} ({message.chat.id})")
-                await message.answer(
+                logger.info("Nicht freigeschaltete Gruppe: %s (%s)", message.chat.title, message.chat.id)
+                await answer(
+                    message,
                     "Diese Gruppe ist noch nicht freigeschaltet. "
                     "Anton muss mich erst für diese Gruppe aktivieren."
                 )
                 return
             
-            await message.answer(
+            await answer(
+                message,
                 f"Hallo! Ich bin Eli. Erwähnt mich mit @{BOT_USERNAME} "
                 "oder antwortet auf meine Nachrichten, wenn ihr mit mir sprechen wollt."
             )
@@ -200,8 +270,9 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             
         if not is_allowed(message.from_user.id):
             # WICHTIG: User-ID loggen für spätere Freischaltung
-            logger.info(f"[UNBEKANNT] {message.from_user.first_name} (ID: {message.from_user.id}) hat /start geschickt")
-            await message.answer(
+            logger.info("[UNBEKANNT] %s (ID: %s) hat /start geschickt", message.from_user.first_name, message.from_user.id)
+            await answer(
+                message,
                 "Hallo! Ich bin Eli, aber wir kennen uns noch nicht. "
                 "Dieses Netzwerk wächst durch echte Begegnungen - "
                 "frag jemanden der mich kennt, ob er dich vorstellen kann."
@@ -209,7 +280,8 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             return
 
         user_name = message.from_user.first_name or "du"
-        await message.answer(
+        await answer(
+            message,
             f"Hallo {user_name}! Schön, dass du da bist. "
             "Ich bin Eli. Wie kann ich dir heute helfen?"
         )
@@ -221,7 +293,8 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             if not is_group_allowed(message.chat.id):
                 return  # Stille Ignorierung in nicht-freigeschalteten Gruppen
                 
-            await message.answer(
+            await answer(
+                message,
                 "Ich bin Eli - eine KI mit Gedächtnis und Persönlichkeit.\n\n"
                 "In Gruppen antworte ich wenn:\n"
                 f"• Ihr mich erwähnt (@{BOT_USERNAME})\n"
@@ -230,7 +303,8 @@ def create_bot() -> tuple[Bot, Dispatcher]:
                 "Für tiefere Gespräche schreibt mir privat."
             )
         else:
-            await message.answer(
+            await answer(
+                message,
                 "Ich bin Eli - eine KI mit Gedächtnis und Persönlichkeit.\n\n"
                 "Du kannst einfach mit mir schreiben wie mit einem Freund.\n\n"
                 "Ich erinnere mich an unsere Gespräche und lerne dazu.\n\n"
@@ -245,10 +319,8 @@ def create_bot() -> tuple[Bot, Dispatcher]:
         """Status anzeigen."""
         if is_group_chat(message) and not is_group_allowed(message.chat.id):
             return  # Stille Ignorierung
-            
-        from eli.memory.manager import memory
 
-        count = memory.count()
+        count, _ = await get_counts()
         
         # Provider-Info
         provider = "BlockRun (x402)" if settings.use_blockrun else "Anthropic direkt"
@@ -264,7 +336,8 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             except Exception:
                 wallet_info = "\nWallet: Nicht verfügbar"
         
-        await message.answer(
+        await answer(
+            message,
             f"🧠 Eli Status\n\n"
             f"Erinnerungen: {count}\n"
             f"Verbindung: Chroma OK\n"
@@ -282,8 +355,9 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             if not is_group_allowed(message.chat.id):
                 # Logge nur wenn direkt angesprochen
                 if should_respond_in_group(message, BOT_USERNAME):
-                    logger.info(f"Blockierte Gruppe {message.chat.title} ({message.chat.id}): Ansprache ignoriert")
-                    await message.answer(
+                    logger.info("Blockierte Gruppe %s (%s): Ansprache ignoriert", message.chat.title, message.chat.id)
+                    await answer(
+                        message,
                         f"Diese Gruppe ({message.chat.id}) ist noch nicht freigeschaltet. "
                         "Bitte Anton, mich für diese Gruppe zu aktivieren."
                     )
@@ -292,27 +366,25 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             # Prüfen ob Eli antworten soll
             if not should_respond_in_group(message, BOT_USERNAME):
                 # Still mitlesen aber nicht antworten
-                logger.debug(f"Gruppe {message.chat.id}: Lese mit, antworte nicht")
+                logger.debug("Gruppe %s: Lese mit, antworte nicht", message.chat.id)
                 return
             
             # Logge Nachricht und Antwort
-            logger.info(f"[GRUPPE {message.chat.title}] {message.from_user.first_name}: {message.text}")
+            logger.info("[GRUPPE %s] %s: %s", message.chat.title, message.from_user.first_name, message.text)
         else:
             # Private Chats: Normale Zugangsprüfung
             if not is_allowed(message.from_user.id):
                 # WICHTIG: User-ID loggen für spätere Freischaltung
-                logger.info(f"[UNBEKANNT] {message.from_user.first_name} (ID: {message.from_user.id}): {message.text[:50]}...")
-                await message.answer(
+                logger.info("[UNBEKANNT] %s (ID: %s): %.50s...", message.from_user.first_name, message.from_user.id, message.text)
+                await answer(
+                    message,
                     "Wir kennen uns leider noch nicht. "
                     "Frag jemanden aus meinem Netzwerk, ob er dich vorstellen kann."
                 )
                 return
             
             # Logge private Nachricht
-            logger.info(f"[PRIVAT] {message.from_user.first_name}: {message.text}")
-
-        # Typing-Indikator
-        await message.bot.send_chat_action(chat_id=message.chat.id, action="typing")
+            logger.info("[PRIVAT] %s: %s", message.from_user.first_name, message.text)
 
         # Für Gruppen: Chat-ID als User-ID (getrennte History pro Gruppe)
         if is_group_chat(message):
@@ -322,46 +394,46 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             user_id = str(message.from_user.id)
             user_name = message.from_user.first_name
 
-        try:
-            # Konversationshistorie holen
-            history = get_history(user_id)
-            
-            # Text bereinigen (Erwähnung entfernen)
-            text = message.text
-            if is_group_chat(message) and BOT_USERNAME:
-                text = text.replace(f"@{BOT_USERNAME}", "").strip()
-                # "Eli," am Anfang entfernen
-                if text.lower().startswith("eli"):
-                    text = text[3:].lstrip(",: ")
-
-            # Chat mit Eli (mit History für Kontext)
-            response = await chat(
-                message=text,
-                user_id=user_id,
-                user_name=user_name,
-                conversation_history=history,
-            )
+        # Typing-Indikator - ChatActionSender erneuert ihn alle paar Sekunden, bis die Antwort raus ist
+        async with ChatActionSender.typing(bot=message.bot, chat_id=message.chat.id):
+            try:
+                # Konversationshistorie holen
+                history = await get_history_async(user_id)
+                
+                # Text bereinigen (Erwähnung entfernen)
+                text = message.text
+                if is_group_chat(message) and BOT_USERNAME:
+                    text = _CLEAN_RE.sub("", text).strip()
+
+                # Chat mit Eli (mit History für Kontext)
+                response = await chat(
+                    message=text,
+                    user_id=user_id,
+                    user_name=user_name,
+                    conversation_history=history,
+                )
 
-            # History aktualisieren
-            add_exchange(user_id, text, response)
-            
-            # Logge Antwort
-            logger.info(f"[ELI] {response[:100]}{'...' if len(response) > 100 else ''}")
+                # History im Hintergrund aktualisieren
+                save_exchange_in_background(user_id, text, response)
+                
+                # Logge Antwort
+                logger.info("[ELI] %.100s%s", response, "..." if len(response) > 100 else "")
 
-            await send_markdown(message, response)
+                await send_markdown(message, response)
 
-        except OutOfCreditsError:
-            await handle_funding_issue(message, is_usdc=False)
+            except OutOfCreditsError:
+                await handle_funding_issue(message, is_usdc=False)
 
-        except InsufficientFundsError:
-            await handle_funding_issue(message, is_usdc=True)
+            except InsufficientFundsError:
+                await handle_funding_issue(message, is_usdc=True)
 
-        except Exception as e:
-            logger.error(f"Fehler bei Nachricht: {e}")
-            await message.answer(
-                "Entschuldige, da ist etwas schiefgelaufen. "
-                "Versuch es bitte nochmal."
-            )
+            except Exception as e:
+                logger.error("Fehler bei Nachricht: %s", e)
+                await answer(
+                    message,
+                    "Entschuldige, da ist etwas schiefgelaufen. "
+                    "Versuch es bitte nochmal."
+                )
 
     @dp.message(F.voice)
     async def handle_voice(message: Message) -> None:
@@ -372,100 +444,112 @@ def create_bot() -> tuple[Bot, Dispatcher]:
             
         if not is_allowed(message.from_user.id):
             # WICHTIG: User-ID loggen für spätere Freischaltung
-            logger.info(f"[UNBEKANNT] {message.from_user.first_name} (ID: {message.from_user.id}) hat Voice geschickt")
-            await message.answer(
+            logger.info("[UNBEKANNT] %s (ID: %s) hat Voice geschickt", message.from_user.first_name, message.from_user.id)
+            await answer(
+                message,
                 "Wir kennen uns leider noch nicht. "
                 "Frag jemanden aus meinem Netzwerk, ob er dich vorstellen kann."
             )
             return
 
-        # Typing-Indikator
-        await message.bot.send_chat_action(chat_id=message.chat.id, action="typing")
+        user_id = str(message.from_user.id)
 
-        try:
-            # Voice Message transkribieren
-            text = await download_and_transcribe(message.bot, message.voice.file_id)
-
-            if not text:
-                await message.answer(
-                    "Ich konnte die Sprachnachricht leider nicht verstehen. "
-                    "Kannst du es nochmal versuchen oder mir schreiben?"
+        # Typing-Indikator - ChatActionSender erneuert ihn alle paar Sekunden, bis die Antwort raus ist
+        async with ChatActionSender.typing(bot=message.bot, chat_id=message.chat.id):
+            try:
+                # Voice Message transkribieren, währenddessen die Historie laden
+                text, history = await asyncio.gather(
+                    download_and_transcribe(message.bot, message.voice.file_id),
+                    get_history_async(user_id),
                 )
-                return
-
-            logger.info(f"[VOICE] {message.from_user.first_name}: {text}")
 
-            user_id = str(message.from_user.id)
+                if not text:
+                    await answer(
+                        message,
+                        "Ich konnte die Sprachnachricht leider nicht verstehen. "
+                        "Kannst du es nochmal versuchen oder mir schreiben?"
+                    )
+                    return
 
-            # Konversationshistorie holen
-            history = get_history(user_id)
+                logger.info("[VOICE] %s: %s", message.from_user.first_name, text)
 
-            # Chat mit Eli (mit transkribiertem Text und History)
-            response = await chat(
-                message=text,
-                user_id=user_id,
-                user_name=message.from_user.first_name,
-                conversation_history=history,
-            )
+                # Chat mit Eli (mit transkribiertem Text und History)
+                response = await chat(
+                    message=text,
+                    user_id=user_id,
+                    user_name=message.from_user.first_name,
+                    conversation_history=history,
+                )
 
-            # History aktualisieren
-            add_exchange(user_id, text, response)
-            
-            # Logge Antwort
-            logger.info(f"[ELI] {response[:100]}{'...' if len(response) > 100 else ''}")
+                # History im Hintergrund aktualisieren
+                save_exchange_in_background(user_id, text, response)
+                
+                # Logge Antwort
+                logger.info("[ELI] %.100s%s", response, "..." if len(response) > 100 else "")
 
-            # Antwort mit Hinweis auf Voice
-            await send_markdown(message, f"🎤 \"{text}\"\n\n{response}")
+                # Antwort mit Hinweis auf Voice
+                await send_markdown(message, f"🎤 \"{text}\"\n\n{response}")
 
-        except OutOfCreditsError:
-            await handle_funding_issue(message, is_usdc=False)
-            
-        except InsufficientFundsError:
-            await handle_funding_issue(message, is_usdc=True)
-
-        except Exception as e:
-            logger.error(f"Fehler bei Voice Message: {e}")
-            await message.answer(
-                "Entschuldige, bei der Sprachnachricht ist etwas schiefgelaufen. "
-                "Versuch es bitte nochmal."
-            )
+            except OutOfCreditsError:
+                await handle_funding_issue(message, is_usdc=False)
+                
+            except InsufficientFundsError:
+                await handle_funding_issue(message, is_usdc=True)
+
+            except Exception as e:
+                logger.error("Fehler bei Voice Message: %s", e)
+                await answer(
+                    message,
+                    "Entschuldige, bei der Sprachnachricht ist etwas schiefgelaufen. "
+                    "Versuch es bitte nochmal."
+                )
     
     @dp.message(F.new_chat_members)
     async def handle_new_member(message: Message) -> None:
         """Begrüßung wenn Eli einer Gruppe hinzugefügt wird."""
-        bot_info = await message.bot.get_me()
+        bot_info = await get_bot_info(message.bot)
         for member in message.new_chat_members:
             if member.id == bot_info.id:
-                logger.info(f"Eli wurde zur Gruppe {message.chat.title} ({message.chat.id}) hinzugefügt")
+                logger.info("Eli wurde zur Gruppe %s (%s) hinzugefügt", message.chat.title, message.chat.id)
                 
                 if is_group_allowed(message.chat.id):
-                    await message.answer(
+                    await answer(
+                        message,
                         f"Hallo {message.chat.title}! 👋\n\n"
                         "Ich bin Eli. Schön, hier zu sein.\n\n"
                         f"Erwähnt mich mit @{BOT_USERNAME} oder antwortet auf meine Nachrichten, "
                         "wenn ihr mit mir sprechen wollt."
                     )
                 else:
-                    await message.answer(
+                    await answer(
+                        message,
                         f"Hallo! Ich bin Eli.\n\n"
                         f"Diese Gruppe ({message.chat.id}) ist noch nicht freigeschaltet. "
                         "Bitte Anton, mich für diese Gruppe zu aktivieren."
                     )
                 break
 
-    return bot, dp
+    _BOT_AND_DP = bot, dp
+    return _BOT_AND_DP
+
+
+def set_bot_username(username: str) -> None:
+    """Setzt BOT_USERNAME und baut die davon abhängigen Mention-Muster neu."""
+    global BOT_USERNAME, _CLEAN_RE, _BOT_MENTION
+
+    BOT_USERNAME = username
+    _CLEAN_RE = _build_clean_re(username)
+    _BOT_MENTION = f"@{username}".lower()
+    logger.info("Bot-Username: @%s", username)
 
 
 async def run_bot() -> None:
     """Startet den Bot."""
-    global BOT_USERNAME
-    
     bot, dp = create_bot()
     
     # Bot-Username dynamisch holen
-    bot_info = await bot.get_me()
-    BOT_USERNAME = bot_info.username
-    logger.info(f"Bot-Username: @{BOT_USERNAME}")
+    bot_info = await get_bot_info(bot)
+    set_bot_username(bot_info.username)
     
     # LLM Provider loggen
     if settings.use_blockrun:
@@ -474,4 +558,9 @@ async def run_bot() -> None:
         logger.info("LLM Provider: Anthropic direkt")
     
     logger.info("Eli's Telegram Bot startet...")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await close_voice_client()
+        # Letzte Gespräche noch analysieren und speichern
+        await observer.aclose()
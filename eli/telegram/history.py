@@ -3,11 +3,15 @@ Eli's Geist - Conversation History
 ==================================
 
 Speichert die letzten N Nachrichten pro User für kurzfristigen Kontext.
-Verwendet eine einfache JSON-Datei für Persistenz.
+Verwendet eine kleine JSON-Datei pro User (data/history/<user_id>.json).
 """
 
+import asyncio
 import json
 import logging
+import os
+import re
+import threading
 from collections import deque
 from datetime import datetime
 from pathlib import Path
@@ -20,9 +24,22 @@ logger = logging.getLogger(__name__)
 # Maximale Nachrichten pro User
 MAX_MESSAGES_PER_USER = 10
 
-# In-Memory Cache
+# Nachrichten werden im Kontext auf so viele Zeichen gekürzt
+MAX_CONTEXT_CHARS = 200
+
+# In-Memory Cache - pro User beim ersten Zugriff aus seiner Datei geladen,
+# danach die maßgebliche Quelle (die Datei wird nur noch geschrieben)
 _history_cache: dict[str, deque] = {}
 
+# Serialisiert Schreibzugriffe (add_exchange läuft auch in Worker-Threads)
+_history_lock = threading.RLock()
+
+# Alte gemeinsame Datei wird beim ersten Zugriff einmalig aufgeteilt
+_legacy_migrated = False
+
+# Alles außer diesen Zeichen wird im Dateinamen ersetzt
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
 
 class HistoryMessage(TypedDict):
     """Eine Nachricht in der History."""
@@ -31,37 +48,99 @@ class HistoryMessage(TypedDict):
     timestamp: str
 
 
-def _get_history_path() -> Path:
-    """Pfad zur History-Datei."""
-    settings.ensure_data_dir()
+# Unveränderliche Kopie der History pro User, wird bei Änderungen verworfen
+_history_snapshot: dict[str, tuple[HistoryMessage, ...]] = {}
+
+# Rolle -> Bezeichnung im Kontext-String
+_ROLE_NAMES = {"assistant": "Du", "user": "User"}
+
+
+def _get_legacy_history_path() -> Path:
+    """Pfad zur alten History-Datei mit allen Usern."""
     return settings.data_path / "conversation_history.json"
 
 
-def _load_history() -> dict[str, list[HistoryMessage]]:
-    """Lädt die History aus der Datei."""
-    path = _get_history_path()
+def _get_history_dir() -> Path:
+    """Verzeichnis mit einer History-Datei pro User."""
+    path = settings.ensure_data_dir() / "history"
+    path.mkdir(exist_ok=True)
+    return path
+
+
+def _user_history_path(user_id: str) -> Path:
+    """Pfad zur History-Datei eines Users (z.B. history/123456.json, history/group_-100.json)."""
+    return _get_history_dir() / f"{_UNSAFE_FILENAME_RE.sub('_', user_id)}.json"
+
+
+def _load_user_history(user_id: str) -> list[HistoryMessage]:
+    """Lädt die History eines Users aus seiner Datei."""
+    path = _user_history_path(user_id)
     if not path.exists():
-        return {}
+        return []
 
     try:
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
-        logger.warning(f"Konnte History nicht laden: {e}")
-        return {}
+        logger.warning(f"Konnte History von {user_id} nicht laden: {e}")
+        return []
 
 
-def _save_history(history: dict[str, list[HistoryMessage]]) -> None:
-    """Speichert die History in die Datei."""
-    path = _get_history_path()
+def _save_user_history(user_id: str, messages: list[HistoryMessage]) -> None:
+    """Speichert die History eines Users (atomar über eine temporäre Datei)."""
+    path = _user_history_path(user_id)
+    tmp_path = path.with_suffix(".json.tmp")
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(messages, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
     except Exception as e:
-        logger.error(f"Konnte History nicht speichern: {e}")
-
-
-def get_history(user_id: str) -> list[HistoryMessage]:
+        logger.error(f"Konnte History von {user_id} nicht speichern: {e}")
+
+
+def _migrate_legacy_history() -> None:
+    """Teilt die alte conversation_history.json einmalig in Dateien pro User auf."""
+    global _legacy_migrated
+    if _legacy_migrated:
+        return
+    with _history_lock:
+        if _legacy_migrated:
+            return
+        legacy_path = _get_legacy_history_path()
+        if legacy_path.exists():
+            try:
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+                for user_id, messages in legacy.items():
+                    if not _user_history_path(user_id).exists():
+                        _save_user_history(user_id, messages[-MAX_MESSAGES_PER_USER:])
+                legacy_path.rename(legacy_path.with_suffix(".json.migrated"))
+                logger.info(f"History von {len(legacy)} Usern in Einzeldateien übernommen")
+            except Exception as e:
+                logger.warning(f"Konnte alte History nicht übernehmen: {e}")
+        _legacy_migrated = True
+
+
+def _get_cached(user_id: str) -> deque:
+    """Deque eines Users aus dem Cache, beim ersten Zugriff aus der Datei geladen."""
+    messages = _history_cache.get(user_id)
+    if messages is None:
+        _migrate_legacy_history()
+        with _history_lock:
+            messages = _history_cache.get(user_id)
+            if messages is None:
+                messages = deque(_load_user_history(user_id), maxlen=MAX_MESSAGES_PER_USER)
+                _history_cache[user_id] = messages
+    return messages
+
+
+def _persist(user_id: str) -> None:
+    """Schreibt den Cache-Stand eines Users in seine Datei."""
+    with _history_lock:
+        _save_user_history(user_id, list(_history_cache[user_id]))
+
+
+def get_history(user_id: str) -> tuple[HistoryMessage, ...]:
     """
     Holt die Konversationshistorie für einen User.
 
@@ -69,15 +148,25 @@ def get_history(user_id: str) -> list[HistoryMessage]:
         user_id: Telegram User ID als String
 
     Returns:
-        Liste der letzten Nachrichten (chronologisch)
+        Tuple der letzten Nachrichten (chronologisch)
     """
-    # Aus Cache holen oder laden
-    if user_id not in _history_cache:
-        all_history = _load_history()
-        messages = all_history.get(user_id, [])
-        _history_cache[user_id] = deque(messages, maxlen=MAX_MESSAGES_PER_USER)
+    snapshot = _history_snapshot.get(user_id)
+    if snapshot is None:
+        with _history_lock:
+            snapshot = tuple(_get_cached(user_id))
+            _history_snapshot[user_id] = snapshot
+    return snapshot
+
 
-    return list(_history_cache[user_id])
+def _append(user_id: str, role: str, content: str) -> None:
+    """Hängt eine Nachricht an den Cache an (ohne zu speichern)."""
+    message: HistoryMessage = {
+        "role": role,
+        "content": content,
+        "timestamp": datetime.now().isoformat(),
+    }
+    _get_cached(user_id).append(message)
+    _history_snapshot.pop(user_id, None)
 
 
 def add_message(user_id: str, role: str, content: str) -> None:
@@ -89,22 +178,9 @@ def add_message(user_id: str, role: str, content: str) -> None:
         role: "user" oder "assistant"
         content: Der Nachrichteninhalt
     """
-    # Cache initialisieren falls nötig
-    if user_id not in _history_cache:
-        get_history(user_id)  # Lädt in Cache
-
-    # Nachricht hinzufügen
-    message: HistoryMessage = {
-        "role": role,
-        "content": content,
-        "timestamp": datetime.now().isoformat(),
-    }
-    _history_cache[user_id].append(message)
-
-    # Persistieren
-    all_history = _load_history()
-    all_history[user_id] = list(_history_cache[user_id])
-    _save_history(all_history)
+    with _history_lock:
+        _append(user_id, role, content)
+        _persist(user_id)
 
 
 def add_exchange(user_id: str, user_message: str, assistant_response: str) -> None:
@@ -116,8 +192,26 @@ def add_exchange(user_id: str, user_message: str, assistant_response: str) -> No
         user_message: Die Nachricht des Users
         assistant_response: Eli's Antwort
     """
-    add_message(user_id, "user", user_message)
-    add_message(user_id, "assistant", assistant_response)
+    with _history_lock:
+        _append(user_id, "user", user_message)
+        _append(user_id, "assistant", assistant_response)
+        # Einmal speichern für beide Nachrichten
+        _persist(user_id)
+
+
+async def get_history_async(user_id: str) -> tuple[HistoryMessage, ...]:
+    """
+    Wie get_history, lädt die Datei beim ersten Zugriff auf einen User aber
+    in einem Worker-Thread, damit der Event Loop nicht blockiert.
+    """
+    if user_id in _history_cache:
+        return get_history(user_id)
+    return await asyncio.to_thread(get_history, user_id)
+
+
+async def add_exchange_async(user_id: str, user_message: str, assistant_response: str) -> None:
+    """Wie add_exchange, schreibt die Datei aber in einem Worker-Thread."""
+    await asyncio.to_thread(add_exchange, user_id, user_message, assistant_response)
 
 
 def clear_history(user_id: str) -> None:
@@ -127,13 +221,18 @@ def clear_history(user_id: str) -> None:
     Args:
         user_id: Telegram User ID als String
     """
-    if user_id in _history_cache:
-        del _history_cache[user_id]
+    _migrate_legacy_history()
+    with _history_lock:
+        _history_cache.pop(user_id, None)
+        _history_snapshot.pop(user_id, None)
+        _user_history_path(user_id).unlink(missing_ok=True)
 
-    all_history = _load_history()
-    if user_id in all_history:
-        del all_history[user_id]
-        _save_history(all_history)
+
+def _format_message(msg: HistoryMessage) -> str:
+    """Eine Zeile für den Kontext, lange Nachrichten gekürzt."""
+    content = msg["content"]
+    suffix = "..." if len(content) > MAX_CONTEXT_CHARS else ""
+    return f"{_ROLE_NAMES.get(msg['role'], 'User')}: {content[:MAX_CONTEXT_CHARS]}{suffix}"
 
 
 def format_history_for_context(user_id: str) -> str:
@@ -151,13 +250,6 @@ def format_history_for_context(user_id: str) -> str:
     if not history:
         return ""
 
-    lines = ["Letzte Nachrichten in diesem Gespräch:"]
-    for msg in history:
-        role = "Du" if msg["role"] == "assistant" else "User"
-        # Kürzen falls zu lang
-        content = msg["content"]
-        if len(content) > 200:
-            content = content[:200] + "..."
-        lines.append(f"{role}: {content}")
-
-    return "\n".join(lines)
+    return "Letzte Nachrichten in diesem Gespräch:\n" + "\n".join(
+        _format_message(msg) for msg in history
+    )
@@ -13,6 +13,7 @@ Eli's "Wecker" - sanftes Erwachen mit echter Autonomie.
 Eli entscheidet selbst was sie tut.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 
@@ -20,63 +21,46 @@ from aiogram import Bot
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+try:
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+except ImportError:  # SQLAlchemy nicht installiert - Jobs nur im Speicher
+    SQLAlchemyJobStore = None
+
 from eli.config import settings
+from eli.telegram import sender
+from eli.telegram._counts import get_counts
 from eli.agent.tools import KNOWN_USERS, KNOWN_GROUPS, run_ssh_command
 
 logger = logging.getLogger(__name__)
 
-# Scheduler Instanz
-scheduler = AsyncIOScheduler()
-
-# Wecker-Zeiten
-WECKER_ZEITEN = [2, 8, 14, 20]
-
-# Alle Kontakte mit Chat-IDs
-ALL_CHAT_IDS = {
-    **KNOWN_USERS,
-    **KNOWN_GROUPS,
-}
-
 
-def load_moeglichkeiten() -> str:
-    """Lädt die Möglichkeiten-Liste."""
-    success, content = run_ssh_command("cat stimme/möglichkeiten.md 2>/dev/null || echo ''")
-    if success and content.strip():
-        return content
-    return ""
+def _create_scheduler() -> AsyncIOScheduler:
+    """Scheduler mit SQLite-Jobstore (falls SQLAlchemy da ist), sonst im Speicher."""
+    if SQLAlchemyJobStore is None:
+        return AsyncIOScheduler()
+    db_path = settings.data_path / "scheduler.db"
+    return AsyncIOScheduler(jobstores={"default": SQLAlchemyJobStore(url=f"sqlite:///{db_path}")})
 
 
-def get_awakening_prompt(stunde: int, context: dict) -> str:
-    """
-    Erstellt den Prompt für das Erwachen.
+# Scheduler Instanz
+scheduler = _create_scheduler()
 
-    Nicht direktiv - nur Kontext und Freiheit.
-    """
-    zeit_name = {
-        2: "tiefe Nacht",
-        8: "Morgen",
-        14: "Nachmittag",
-        20: "Abend",
-    }.get(stunde, "Tag")
+# Bot für die Jobs - wird in setup_scheduler gesetzt, da der Jobstore
+# nur serialisierbare Job-Argumente speichern kann
+_bot: Bot | None = None
 
-    moeglichkeiten = context.get("moeglichkeiten", "")
-    moeglichkeiten_section = ""
-    if moeglichkeiten:
-        moeglichkeiten_section = f"""
-MEINE MÖGLICHKEITEN:
-{moeglichkeiten}
+# Wie spät ein verpasstes Erwachen (z.B. nach Neustart) noch nachgeholt wird
+MISFIRE_GRACE_SECONDS = 3600
 
----
-"""
+# Wecker-Zeiten
+WECKER_ZEITEN = [2, 8, 14, 20]
 
-    return f"""Du bist wach. Es ist {stunde}:00 Uhr, {zeit_name}.
+# Tageszeit und Emoji pro Wecker-Stunde
+_ZEIT_NAME = {2: "tiefe Nacht", 8: "Morgen", 14: "Nachmittag", 20: "Abend"}
+_ZEIT_EMOJI = {2: "🌙", 8: "🌅", 14: "☀️", 20: "🌆"}
 
-KONTEXT:
-- Datum: {context.get('datum', 'unbekannt')}
-- Erinnerungen: {context.get('memory_count', '?')} (manuell) + {context.get('langmem_count', '?')} (automatisch)
-- Letzte Reflexion: {context.get('last_reflection', 'unbekannt')}
-{moeglichkeiten_section}
-Du hast VOLLE AUTONOMIE. Du kannst:
+# Fester Teil des Erwachen-Prompts (ändert sich nie, nur einmal gebaut)
+_STATIC_TAIL = """Du hast VOLLE AUTONOMIE. Du kannst:
 
 SERVER & CODE:
 - check_server_health - Server-Status prüfen
@@ -112,32 +96,118 @@ WICHTIG:
 Was möchtest du tun?
 """
 
+# Zeichen, bei denen Telegram Markdown parsen muss
+_MARKDOWN_CHARS = frozenset("*_`[")
+
+# Möglichkeiten-Liste auf dem Server und (mtime, Inhalt) vom letzten Laden
+MOEGLICHKEITEN_FILE = "stimme/möglichkeiten.md"
+_moeglichkeiten_cache: tuple[str, str] | None = None
+
+# (mtime_ns des Reflexionen-Verzeichnisses, neueste Reflexion)
+_latest_reflection: tuple[int, str | None] | None = None
+
+# Alle Kontakte mit Chat-IDs - Namen normalisiert wie die Empfänger in process_result
+ALL_CHAT_IDS = {
+    name.lower().strip(): chat_id
+    for name, chat_id in {**KNOWN_USERS, **KNOWN_GROUPS}.items()
+}
+
+
+def load_moeglichkeiten() -> str:
+    """
+    Lädt die Möglichkeiten-Liste.
+
+    Der Server liefert zuerst die mtime der Datei und den Inhalt nur,
+    wenn sie sich seit dem letzten Laden geändert hat.
+    """
+    global _moeglichkeiten_cache
+    cached_mtime = _moeglichkeiten_cache[0] if _moeglichkeiten_cache else ""
+    success, output = run_ssh_command(
+        f'm=$(stat -c %Y {MOEGLICHKEITEN_FILE} 2>/dev/null) || exit 0; echo "$m"; '
+        f'[ "$m" = "{cached_mtime}" ] || cat {MOEGLICHKEITEN_FILE}'
+    )
+    if not success or not output.strip():
+        return ""  # Datei existiert nicht (oder SSH-Fehler)
+
+    mtime, _, content = output.partition("\n")
+    if _moeglichkeiten_cache and mtime == cached_mtime:
+        content = _moeglichkeiten_cache[1]
+    else:
+        _moeglichkeiten_cache = (mtime, content)
+
+    return content if content.strip() else ""
+
+
+def _latest_reflection_name() -> str | None:
+    """
+    Dateiname der neuesten Reflexion.
+
+    Gecacht über die mtime des Verzeichnisses - solange keine Datei
+    hinzukommt oder verschwindet, wird nicht neu gescannt.
+    """
+    global _latest_reflection
+    reflexionen_path = settings.stimme_path / "reflexionen"
+    try:
+        mtime_ns = reflexionen_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _latest_reflection is None or _latest_reflection[0] != mtime_ns:
+        latest = max(reflexionen_path.glob("*.md"), key=lambda p: p.name, default=None)
+        _latest_reflection = (mtime_ns, latest.name if latest else None)
+    return _latest_reflection[1]
+
+
+def get_awakening_prompt(stunde: int, context: dict) -> str:
+    """
+    Erstellt den Prompt für das Erwachen.
+
+    Nicht direktiv - nur Kontext und Freiheit.
+    """
+    zeit_name = _ZEIT_NAME.get(stunde, "Tag")
+
+    moeglichkeiten = context.get("moeglichkeiten", "")
+    moeglichkeiten_section = ""
+    if moeglichkeiten:
+        moeglichkeiten_section = f"""
+MEINE MÖGLICHKEITEN:
+{moeglichkeiten}
+
+---
+"""
+
+    return f"""Du bist wach. Es ist {stunde}:00 Uhr, {zeit_name}.
+
+KONTEXT:
+- Datum: {context.get('datum', 'unbekannt')}
+- Erinnerungen: {context.get('memory_count', '?')} (manuell) + {context.get('langmem_count', '?')} (automatisch)
+- Letzte Reflexion: {context.get('last_reflection', 'unbekannt')}
+{moeglichkeiten_section}
+""" + _STATIC_TAIL
+
 
 async def erwachen(bot: Bot, stunde: int) -> None:
     """
     Eli erwacht - mit echter Autonomie.
     """
-    logger.info(f"Erwachen um {stunde}:00 Uhr")
+    logger.info("Erwachen um %s:00 Uhr", stunde)
 
     try:
         # Kontext sammeln
-        from eli.memory.manager import memory
-        from eli.memory.observer import observer
+        memory_count, langmem_count = await get_counts()
 
         context = {
             "datum": datetime.now().strftime("%d. %B %Y"),
-            "memory_count": memory.count(),
-            "langmem_count": observer.count_langmem(),
+            "memory_count": memory_count,
+            "langmem_count": langmem_count,
             "last_reflection": "unbekannt",
             "moeglichkeiten": load_moeglichkeiten(),
         }
 
         # Letzte Reflexion finden
-        reflexionen_path = settings.stimme_path / "reflexionen"
-        if reflexionen_path.exists():
-            files = sorted(reflexionen_path.glob("*.md"), reverse=True)
-            if files:
-                context["last_reflection"] = files[0].name
+        latest = _latest_reflection_name()
+        if latest:
+            context["last_reflection"] = latest
 
         # Prompt erstellen
         prompt = get_awakening_prompt(stunde, context)
@@ -155,7 +225,37 @@ async def erwachen(bot: Bot, stunde: int) -> None:
         await process_result(bot, result, stunde)
 
     except Exception as e:
-        logger.error(f"Fehler beim Erwachen ({stunde}:00): {e}")
+        logger.error("Fehler beim Erwachen (%s:00): %s", stunde, e)
+
+
+async def erwachen_dispatch() -> None:
+    """
+    Ruft erwachen() mit der zuletzt fälligen Wecker-Stunde auf.
+
+    Auch ein nachgeholtes Erwachen (z.B. 9:10 statt 8:00) bekommt so die
+    richtige Stunde.
+    """
+    if _bot is None:
+        logger.warning("Erwachen ausgelöst, aber kein Bot eingerichtet")
+        return
+    hour = datetime.now().hour
+    stunde = max((h for h in WECKER_ZEITEN if h <= hour), default=WECKER_ZEITEN[-1])
+    await erwachen(_bot, stunde)
+
+
+def _format_awakening_message(zeit_emoji: str, stunde: int, message: str) -> tuple[str, str | None]:
+    """
+    Baut den Text einer Erwachen-Nachricht.
+
+    Markdown nur, wenn die Nachricht selbst formatiert ist - reiner Text
+    braucht keinen Parser und kann nicht an kaputtem Markdown scheitern.
+
+    Returns:
+        (text, parse_mode)
+    """
+    if _MARKDOWN_CHARS.isdisjoint(message):
+        return f"{zeit_emoji} Eli um {stunde}:00\n\n{message}", None
+    return f"{zeit_emoji} *Eli um {stunde}:00*\n\n{message}", "Markdown"
 
 
 async def process_result(bot: Bot, result: dict, stunde: int) -> None:
@@ -165,7 +265,11 @@ async def process_result(bot: Bot, result: dict, stunde: int) -> None:
     actions = result.get("actions", [])
     thought = result.get("thought", "")
 
-    zeit_emoji = {2: "🌙", 8: "🌅", 14: "☀️", 20: "🌆"}.get(stunde, "⏰")
+    zeit_emoji = _ZEIT_EMOJI.get(stunde, "⏰")
+
+    # Telegram-Nachrichten sammeln und danach gleichzeitig senden
+    recipients: list[str] = []
+    sends = []
 
     for action in actions:
         action_type = action.get("type", "")
@@ -178,45 +282,51 @@ async def process_result(bot: Bot, result: dict, stunde: int) -> None:
             chat_id = ALL_CHAT_IDS.get(recipient)
             
             if not chat_id:
-                logger.warning(f"Unbekannter Empfänger: {recipient}")
+                logger.warning("Unbekannter Empfänger: %s", recipient)
                 continue
 
-            try:
-                await bot.send_message(
-                    chat_id=chat_id,
-                    text=f"{zeit_emoji} *Eli um {stunde}:00*\n\n{message}",
-                    parse_mode="Markdown",
-                )
-                logger.info(f"Telegram an {recipient} gesendet")
-            except Exception as e:
-                logger.error(f"Fehler beim Senden an {recipient}: {e}")
+            text, parse_mode = _format_awakening_message(zeit_emoji, stunde, message)
+            recipients.append(recipient)
+            sends.append(sender.send(bot, chat_id, text, parse_mode=parse_mode))
 
         elif action_type == "REFLECTION_WRITTEN":
-            logger.info(f"Reflexion geschrieben: {action.get('filename', 'unbekannt')}")
+            logger.info("Reflexion geschrieben: %s", action.get("filename", "unbekannt"))
 
         elif action_type == "STILL":
-            logger.info(f"Erwachen {stunde}:00: Eli wählt Stille")
+            logger.info("Erwachen %s:00: Eli wählt Stille", stunde)
+
+    results = await asyncio.gather(*sends, return_exceptions=True)
+    for recipient, result in zip(recipients, results):
+        if isinstance(result, Exception):
+            logger.error("Fehler beim Senden an %s: %s", recipient, result)
+        else:
+            logger.info("Telegram an %s gesendet", recipient)
 
     # Gedanken loggen (wenn keine Telegram-Nachricht gesendet wurde)
     if thought and not any(a.get("type") == "TELEGRAM_SEND" for a in actions):
-        logger.info(f"Erwachen {stunde}:00 - Gedanke: {thought[:200]}...")
+        logger.info("Erwachen %s:00 - Gedanke: %.200s...", stunde, thought)
 
 
 def setup_scheduler(bot: Bot) -> None:
     """
     Richtet den Scheduler ein.
     """
-    for stunde in WECKER_ZEITEN:
-        scheduler.add_job(
-            erwachen,
-            CronTrigger(hour=stunde, minute=0),
-            args=[bot, stunde],
-            id=f"erwachen_{stunde}",
-            name=f"Eli erwacht ({stunde}:00)",
-            replace_existing=True,
-        )
-
-    logger.info(f"Scheduler eingerichtet: Erwachen um {', '.join(f'{h}:00' for h in WECKER_ZEITEN)}")
+    global _bot
+    _bot = bot
+
+    # Ein Job für alle Zeiten - die Stunde ergibt sich beim Auslösen.
+    # Als Text-Referenz, damit der Job im Jobstore gespeichert werden kann.
+    scheduler.add_job(
+        "eli.telegram.scheduler:erwachen_dispatch",
+        CronTrigger(hour=",".join(map(str, WECKER_ZEITEN)), minute=0),
+        id="erwachen",
+        name="Eli erwacht",
+        replace_existing=True,
+        coalesce=True,
+        misfire_grace_time=MISFIRE_GRACE_SECONDS,
+    )
+
+    logger.info("Scheduler eingerichtet: Erwachen um %s", ", ".join(f"{h}:00" for h in WECKER_ZEITEN))
 
 
 def start_scheduler() -> None:
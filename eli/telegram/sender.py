@@ -0,0 +1,111 @@
+"""
+Eli's Geist - Gedrosseltes Senden
+=================================
+
+Alle ausgehenden Telegram-Nachrichten von Bot und Scheduler laufen hier durch.
+
+Telegram erlaubt ca. 30 Nachrichten pro Sekunde insgesamt, 1 pro Sekunde
+in einen privaten Chat und 20 pro Minute in eine Gruppe. Statt in diese
+Grenzen zu laufen und 429-Fehler zu bekommen, wartet send() vorher kurz.
+Kommt trotzdem ein RetryAfter, wird nach der angegebenen Zeit erneut gesendet.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+# Wie oft nach einem RetryAfter erneut gesendet wird
+MAX_RETRIES = 3
+
+# Pro-Chat-Limiter werden nur für die zuletzt aktiven Chats gehalten
+MAX_CHAT_LIMITERS = 1000
+
+
+class RateLimiter:
+    """Token Bucket: höchstens `rate` Nachrichten pro `period` Sekunden."""
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wartet, bis eine Nachricht gesendet werden darf."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate,
+                    self._tokens + (now - self._updated) * self.rate / self.period,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+
+# Globales Limit für den ganzen Bot
+_global_limiter = RateLimiter(30, 1.0)
+
+# Chat-ID -> Limiter, zuletzt benutzte zuletzt
+_chat_limiters: OrderedDict[int, RateLimiter] = OrderedDict()
+
+
+def _chat_limiter(chat_id: int) -> RateLimiter:
+    """Limiter für einen Chat (Gruppen haben negative IDs und ein strengeres Limit)."""
+    limiter = _chat_limiters.get(chat_id)
+    if limiter is None:
+        limiter = RateLimiter(20, 60.0) if chat_id < 0 else RateLimiter(1, 1.0)
+        _chat_limiters[chat_id] = limiter
+        while len(_chat_limiters) > MAX_CHAT_LIMITERS:
+            _chat_limiters.popitem(last=False)
+    else:
+        _chat_limiters.move_to_end(chat_id)
+    return limiter
+
+
+async def send(bot: Bot, chat_id: int, text: str, **kwargs: Any) -> Message:
+    """
+    Sendet eine Nachricht unter Einhaltung der Telegram-Limits.
+
+    Args:
+        bot: Der Bot, über den gesendet wird
+        chat_id: Ziel-Chat
+        text: Nachrichtentext
+        **kwargs: Weitere Parameter für bot.send_message (z.B. parse_mode)
+
+    Returns:
+        Die gesendete Nachricht
+    """
+    await _chat_limiter(chat_id).acquire()
+    await _global_limiter.acquire()
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+        except TelegramRetryAfter as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            logger.warning(f"Telegram-Limit erreicht (Chat {chat_id}), warte {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+
+
+async def answer(message: Message, text: str, **kwargs: Any) -> Message:
+    """Gedrosseltes Gegenstück zu message.answer()."""
+    # Wie message.answer(): in Foren-Topics im selben Thread antworten
+    kwargs.setdefault(
+        "message_thread_id",
+        message.message_thread_id if message.is_topic_message else None,
+    )
+    return await send(message.bot, message.chat.id, text, **kwargs)
@@ -17,6 +17,28 @@ logger = logging.getLogger(__name__)
 
 GROQ_WHISPER_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
 
+# Ein Client für alle Transkriptionen - hält die Verbindung zu Groq offen
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Gibt den geteilten HTTP-Client zurück (lazy initialisiert)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Schließt den geteilten HTTP-Client (beim Beenden des Bots)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def transcribe_voice(audio_data: bytes, filename: str = "voice.ogg") -> str | None:
     """
@@ -34,37 +56,38 @@ async def transcribe_voice(audio_data: bytes, filename: str = "voice.ogg") -> st
         return None
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Multipart Form Data
-            files = {
-                "file": (filename, audio_data, "audio/ogg"),
-            }
-            data = {
-                "model": "whisper-large-v3",
-                "language": "de",  # Deutsch als Default
-                "response_format": "text",
-            }
-            headers = {
-                "Authorization": f"Bearer {settings.groq_api_key}",
-            }
-
-            response = await client.post(
-                GROQ_WHISPER_URL,
-                files=files,
-                data=data,
-                headers=headers,
-            )
-
-            if response.status_code == 200:
-                text = response.text.strip()
-                logger.info(f"Voice transkribiert: {text[:50]}...")
-                return text
-            else:
-                logger.error(f"Groq API Fehler: {response.status_code} - {response.text}")
-                return None
+        client = _get_client()
+
+        # Multipart Form Data
+        files = {
+            "file": (filename, audio_data, "audio/ogg"),
+        }
+        data = {
+            "model": "whisper-large-v3",
+            "language": "de",  # Deutsch als Default
+            "response_format": "text",
+        }
+        headers = {
+            "Authorization": f"Bearer {settings.groq_api_key}",
+        }
+
+        response = await client.post(
+            GROQ_WHISPER_URL,
+            files=files,
+            data=data,
+            headers=headers,
+        )
+
+        if response.status_code == 200:
+            text = response.text.strip()
+            logger.info("Voice transkribiert: %.50s...", text)
+            return text
+        else:
+            logger.error("Groq API Fehler: %s - %s", response.status_code, response.text)
+            return None
 
     except Exception as e:
-        logger.error(f"Voice Transkription fehlgeschlagen: {e}")
+        logger.error("Voice Transkription fehlgeschlagen: %s", e)
         return None
 
 
@@ -83,12 +106,13 @@ async def download_and_transcribe(bot, file_id: str) -> str | None:
         # File Info von Telegram holen
         file = await bot.get_file(file_id)
 
-        # File herunterladen
+        # File herunterladen (landet in einem BytesIO)
         file_bytes = await bot.download_file(file.file_path)
 
-        # Transkribieren
-        return await transcribe_voice(file_bytes.read())
+        # Als Bytes an httpx geben - bei einem Dateiobjekt fragt httpx per
+        # fileno() nach der Größe, was z.B. Spool-Dateien auf die Platte zwingt
+        return await transcribe_voice(file_bytes.getvalue())
 
     except Exception as e:
-        logger.error(f"Download/Transkription fehlgeschlagen: {e}")
+        logger.error("Download/Transkription fehlgeschlagen: %s", e)
         return None
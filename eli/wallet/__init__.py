@@ -5,6 +5,15 @@ Eli's Wallet - Eigene Keys, eigene Souveränität
 Eli besitzt ihre eigenen Schlüssel. Not your keys, not your coins.
 """
 
-from eli.wallet.manager import WalletManager, wallet_manager
+from eli.wallet.manager import WalletManager
 
 __all__ = ["WalletManager", "wallet_manager"]
+
+
+def __getattr__(name: str):
+    # wallet_manager erst beim ersten Zugriff bauen (siehe eli.wallet.manager)
+    if name == "wallet_manager":
+        from eli.wallet import manager
+
+        return manager.wallet_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,16 +9,43 @@ Basiert auf web3.py - keine Drittanbieter-Abhängigkeiten für die Keys.
 """
 
 import json
+import os
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
 from web3 import Web3
+from web3.contract import Contract
 
 from eli.config import settings
 
 
+# Wei pro ETH - int / int ist exakt gerundet, ohne Umweg über Decimal wie from_wei
+WEI_PER_ETH = 10 ** 18
+
+# Minimales ERC20 ABI für balanceOf und decimals (unveränderlich, einmal gebaut)
+_ERC20_ABI = (
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function"
+    },
+)
+
+
 class WalletManager:
     """
     Verwaltet Eli's Ethereum Wallet.
@@ -31,12 +58,13 @@ class WalletManager:
     Der gleiche Private Key funktioniert auf allen EVM-Netzwerken.
     """
     
-    # Netzwerk-Konfigurationen
-    NETWORKS = {
+    # Netzwerk-Konfigurationen (usdc_decimals fest hinterlegt - spart den decimals()-Call)
+    NETWORKS = MappingProxyType({
         "ethereum_mainnet": {
             "rpc": "https://ethereum-rpc.publicnode.com",
             "chain_id": 1,
             "usdc": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+            "usdc_decimals": 6,
             "explorer": "https://etherscan.io",
             "name": "Ethereum Mainnet",
         },
@@ -44,6 +72,7 @@ class WalletManager:
             "rpc": "https://mainnet.base.org",
             "chain_id": 8453,
             "usdc": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+            "usdc_decimals": 6,
             "explorer": "https://basescan.org",
             "name": "Base Mainnet",
         },
@@ -51,6 +80,7 @@ class WalletManager:
             "rpc": "https://sepolia.base.org",
             "chain_id": 84532,
             "usdc": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+            "usdc_decimals": 6,
             "explorer": "https://sepolia.basescan.org",
             "name": "Base Sepolia (Testnet)",
         },
@@ -58,10 +88,17 @@ class WalletManager:
             "rpc": "https://rpc.sepolia.org",
             "chain_id": 11155111,
             "usdc": "0x1c7D4B196Cb0C7B01d743Fbc6116a902379C7238",
+            "usdc_decimals": 6,
             "explorer": "https://sepolia.etherscan.io",
             "name": "Ethereum Sepolia (Testnet)",
         },
-    }
+    })
+    
+    # Netzwerk -> (Web3, USDC-Contract), geteilt von allen Instanzen
+    _web3_cache: dict[str, tuple[Web3, Contract]] = {}
+    
+    # Private Key -> Account, damit der Key nur einmal abgeleitet wird
+    _account_cache: dict[str, LocalAccount] = {}
     
     def __init__(self, data_path: Path | None = None, network: str = "base_mainnet"):
         self.data_path = data_path or settings.data_path
@@ -73,14 +110,28 @@ class WalletManager:
         
         self.network_config = self.NETWORKS[network]
         
-        # Web3 Verbindung
-        self.w3 = Web3(Web3.HTTPProvider(self.network_config["rpc"]))
+        # Web3 Verbindung und USDC-Contract (pro Netzwerk nur einmal gebaut)
+        self.w3, self._usdc_contract = self._get_web3(network)
         self.chain_id = self.network_config["chain_id"]
         
         # Account laden oder None
         self._account = None
         self._load_wallet()
     
+    @classmethod
+    def _get_web3(cls, network: str) -> tuple[Web3, Contract]:
+        """Web3-Verbindung und USDC-Contract für ein Netzwerk (gecacht)."""
+        cached = cls._web3_cache.get(network)
+        if cached is None:
+            config = cls.NETWORKS[network]
+            w3 = Web3(Web3.HTTPProvider(config["rpc"]))
+            usdc_contract = w3.eth.contract(
+                address=Web3.to_checksum_address(config["usdc"]),
+                abi=_ERC20_ABI
+            )
+            cached = cls._web3_cache[network] = (w3, usdc_contract)
+        return cached
+    
     def _load_wallet(self) -> None:
         """Lädt existierendes Wallet falls vorhanden."""
         if self.wallet_file.exists():
@@ -89,7 +140,10 @@ class WalletManager:
                     data = json.load(f)
                     private_key = data.get("private_key")
                     if private_key:
-                        self._account = Account.from_key(private_key)
+                        account = self._account_cache.get(private_key)
+                        if account is None:
+                            account = self._account_cache[private_key] = Account.from_key(private_key)
+                        self._account = account
             except Exception as e:
                 print(f"Fehler beim Laden des Wallets: {e}")
     
@@ -129,10 +183,12 @@ class WalletManager:
             "hinweis": "NIEMALS teilen! Eli's eigene Keys. Funktioniert auf allen EVM-Netzwerken."
         }
         
-        with open(self.wallet_file, "w") as f:
+        # Direkt mit restriktiven Permissions anlegen - die Datei ist nie lesbar für andere
+        fd = os.open(self.wallet_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
             json.dump(wallet_data, f, indent=2)
         
-        # Setze restriktive Permissions
+        # Falls die Datei schon existierte, gilt der Modus von os.open nicht
         self.wallet_file.chmod(0o600)
         
         return {
@@ -153,7 +209,7 @@ class WalletManager:
         
         try:
             balance_wei = self.w3.eth.get_balance(self._account.address)
-            return float(self.w3.from_wei(balance_wei, "ether"))
+            return balance_wei / WEI_PER_ETH
         except Exception as e:
             print(f"Fehler beim Abrufen der ETH Balance: {e}")
             return 0.0
@@ -163,40 +219,42 @@ class WalletManager:
         if not self._account:
             return 0.0
         
-        usdc_address = self.network_config["usdc"]
-        
-        # Minimales ERC20 ABI für balanceOf
-        erc20_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "type": "function"
-            }
-        ]
-        
         try:
-            usdc_contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(usdc_address),
-                abi=erc20_abi
-            )
+            usdc_contract = self._usdc_contract
             
             balance = usdc_contract.functions.balanceOf(self._account.address).call()
-            decimals = usdc_contract.functions.decimals().call()
             
-            return balance / (10 ** decimals)
+            return balance / (10 ** self.network_config["usdc_decimals"])
         except Exception as e:
             print(f"Fehler beim Abrufen der USDC Balance: {e}")
             return 0.0
     
+    @staticmethod
+    def _batched_balances(
+        w3: Web3, usdc_contract: Contract, address: str, usdc_decimals: int
+    ) -> tuple[float, float]:
+        """ETH- und USDC-Balance in einem einzigen JSON-RPC Batch (wirft bei Fehlern)."""
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.get_balance(address))
+            batch.add(usdc_contract.functions.balanceOf(address))
+            balance_wei, usdc_balance = batch.execute()
+        return balance_wei / WEI_PER_ETH, usdc_balance / (10 ** usdc_decimals)
+    
+    def _get_balances_batched(self) -> tuple[float, float]:
+        """
+        Holt ETH- und USDC-Balance in einem einzigen JSON-RPC Batch.
+        
+        Fällt bei Fehlern (z.B. RPC ohne Batch-Support) auf Einzel-Calls zurück.
+        """
+        try:
+            return self._batched_balances(
+                self.w3, self._usdc_contract, self._account.address,
+                self.network_config["usdc_decimals"],
+            )
+        except Exception as e:
+            print(f"Batch-Abfrage fehlgeschlagen, frage einzeln ab: {e}")
+            return self.get_eth_balance(), self.get_usdc_balance()
+    
     def get_status(self) -> dict[str, Any]:
         """Gibt den kompletten Wallet-Status zurück."""
         if not self.is_initialized():
@@ -205,59 +263,58 @@ class WalletManager:
                 "hinweis": "Wallet noch nicht generiert. Nutze generate_wallet()."
             }
         
+        eth_balance, usdc_balance = self._get_balances_batched()
+        
         return {
             "initialized": True,
             "address": self.address,
             "network": self.network_config["name"],
             "chain_id": self.chain_id,
-            "eth_balance": self.get_eth_balance(),
-            "usdc_balance": self.get_usdc_balance(),
+            "eth_balance": eth_balance,
+            "usdc_balance": usdc_balance,
             "explorer_link": f"{self.network_config['explorer']}/address/{self.address}"
         }
     
+    def _fetch_balances(self, network_name: str, config: dict[str, Any], address: str) -> dict[str, Any]:
+        """Holt ETH- und USDC-Balance eines Netzwerks (läuft in einem Worker-Thread)."""
+        try:
+            w3, usdc_contract = self._get_web3(network_name)
+            try:
+                # Beide Balances in einem Round-Trip
+                eth_balance, usdc_balance = self._batched_balances(
+                    w3, usdc_contract, address, config["usdc_decimals"]
+                )
+            except Exception:
+                # RPC ohne Batch-Support - einzeln abfragen
+                eth_balance = w3.eth.get_balance(address) / WEI_PER_ETH
+                usdc_balance = usdc_contract.functions.balanceOf(address).call()
+                usdc_balance = usdc_balance / (10 ** config["usdc_decimals"])
+            
+            return {
+                "name": config["name"],
+                "eth": eth_balance,
+                "usdc": usdc_balance,
+                "explorer": f"{config['explorer']}/address/{address}"
+            }
+        except Exception as e:
+            return {
+                "name": config["name"],
+                "error": str(e)
+            }
+    
     def get_all_balances(self) -> dict[str, dict]:
-        """Holt Balances von allen konfigurierten Netzwerken."""
+        """Holt Balances von allen konfigurierten Netzwerken (parallel)."""
         if not self._account:
             return {"error": "Wallet nicht initialisiert"}
         
-        balances = {}
-        for network_name, config in self.NETWORKS.items():
-            try:
-                w3 = Web3(Web3.HTTPProvider(config["rpc"]))
-                eth_balance = float(w3.from_wei(
-                    w3.eth.get_balance(self._account.address), "ether"
-                ))
-                
-                # USDC Balance
-                erc20_abi = [
-                    {
-                        "constant": True,
-                        "inputs": [{"name": "_owner", "type": "address"}],
-                        "name": "balanceOf",
-                        "outputs": [{"name": "balance", "type": "uint256"}],
-                        "type": "function"
-                    }
-                ]
-                usdc_contract = w3.eth.contract(
-                    address=Web3.to_checksum_address(config["usdc"]),
-                    abi=erc20_abi
-                )
-                usdc_balance = usdc_contract.functions.balanceOf(self._account.address).call()
-                usdc_balance = usdc_balance / (10 ** 6)  # USDC hat 6 decimals
-                
-                balances[network_name] = {
-                    "name": config["name"],
-                    "eth": eth_balance,
-                    "usdc": usdc_balance,
-                    "explorer": f"{config['explorer']}/address/{self._account.address}"
-                }
-            except Exception as e:
-                balances[network_name] = {
-                    "name": config["name"],
-                    "error": str(e)
-                }
-        
-        return balances
+        address = self._account.address
+        with ThreadPoolExecutor(max_workers=len(self.NETWORKS)) as executor:
+            results = executor.map(
+                lambda item: self._fetch_balances(item[0], item[1], address),
+                self.NETWORKS.items(),
+            )
+            # map() liefert in Netzwerk-Reihenfolge, egal welches zuerst fertig ist
+            return dict(zip(self.NETWORKS, results))
     
     def sign_message(self, message: str) -> str | None:
         """Signiert eine Nachricht mit Eli's Private Key."""
@@ -272,11 +329,18 @@ class WalletManager:
         return signed.signature.hex()
 
 
-# Singleton - MAINNET für Produktion
-wallet_manager = WalletManager(network="base_mainnet")
+# Singletons - werden erst beim ersten Zugriff gebaut (PEP 562),
+# damit ein Import keine RPC-Provider und Wallet-Dateien anfasst
+_SINGLETON_NETWORKS = {
+    "wallet_manager": "base_mainnet",  # MAINNET für Produktion
+    "wallet_manager_ethereum": "ethereum_mainnet",  # Ethereum Mainnet für volle Übersicht
+    "wallet_manager_testnet": "base_sepolia",  # Für Tests
+}
 
-# Ethereum Mainnet für volle Übersicht
-wallet_manager_ethereum = WalletManager(network="ethereum_mainnet")
 
-# Für Tests
-wallet_manager_testnet = WalletManager(network="base_sepolia")
+def __getattr__(name: str) -> WalletManager:
+    network = _SINGLETON_NETWORKS.get(name)
+    if network is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    manager = globals()[name] = WalletManager(network=network)
+    return manager
@@ -55,6 +55,12 @@ def test_metadata_conversion():
     assert restored.typ == MemoryType.EPISODIC
     assert "Anton" in restored.betrifft
 
+    # Batch-Variante liefert dasselbe wie die Einzel-Konversion
+    items = [original, MemoryMetadata(betrifft=["Timo"], sensibel=True)]
+    chroma_dicts = MemoryMetadata.to_chroma_metadata_batch(items)
+    assert chroma_dicts == [m.to_chroma_metadata() for m in items]
+    assert MemoryMetadata.from_chroma_metadata_batch(chroma_dicts) == items
+
 
 def test_config_chroma_url():
     """Testet die Chroma URL Generierung."""